@@ -0,0 +1,45 @@
+"""Times the engines of the denoise filter on a synthetic recording.
+
+Run with `python benchmarks/denoise.py`. The numba engine, which the default 'auto' engine picks
+when numba is installed, is skipped otherwise. Its compilation on first call is not timed.
+"""
+import importlib.util
+import timeit
+
+import numpy as np
+
+import tonic.transforms as transforms
+
+
+def random_events(n_events, sensor_size):
+    events = np.zeros(
+        n_events,
+        dtype=np.dtype([("x", "<i2"), ("y", "<i2"), ("t", "<i8"), ("p", "i1")]),
+    )
+    events["x"] = np.random.randint(0, sensor_size[0], n_events)
+    events["y"] = np.random.randint(0, sensor_size[1], n_events)
+    events["p"] = np.random.randint(0, sensor_size[2], n_events)
+    events["t"] = np.sort(np.random.randint(0, 10_000_000, n_events))
+    return events
+
+
+if __name__ == "__main__":
+    sensor_size = (346, 260, 2)
+    np.random.seed(0)
+    events = random_events(1_000_000, sensor_size)
+
+    engines = ["loop", "vectorized"]
+    if importlib.util.find_spec("numba") is not None:
+        engines.append("numba")
+
+    # the reference loop takes seconds, so every engine is timed once and reported as best of 3
+    print(f"{len(events)} events")
+    durations = {}
+    for engine in engines:
+        transform = transforms.Denoise(filter_time=10000, engine=engine)
+        transform(events[:1000])
+        durations[engine] = min(
+            timeit.repeat(lambda: transform(events), number=1, repeat=3)
+        )
+        speedup = durations["loop"] / durations[engine]
+        print(f"{engine:<12}{durations[engine] * 1e3:10.1f} ms{speedup:8.1f}x")
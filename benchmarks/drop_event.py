@@ -0,0 +1,45 @@
+"""Times the event dropping transforms on a synthetic recording.
+
+Run with `python benchmarks/drop_event.py`.
+"""
+import timeit
+
+import numpy as np
+
+import tonic.transforms as transforms
+
+
+def random_events(n_events, sensor_size):
+    events = np.zeros(
+        n_events,
+        dtype=np.dtype([("x", "<i2"), ("y", "<i2"), ("t", "<i8"), ("p", "i1")]),
+    )
+    events["x"] = np.random.randint(0, sensor_size[0], n_events)
+    events["y"] = np.random.randint(0, sensor_size[1], n_events)
+    events["p"] = np.random.randint(0, sensor_size[2], n_events)
+    events["t"] = np.sort(np.random.randint(0, 10_000_000, n_events))
+    return events
+
+
+if __name__ == "__main__":
+    sensor_size = (346, 260, 2)
+    events = random_events(2_000_000, sensor_size)
+
+    benchmarks = {
+        "DropEvent(p=0.1)": transforms.DropEvent(p=0.1),
+        "DropEvent(p=0.9)": transforms.DropEvent(p=0.9),
+        "DropEventByTime(0.2)": transforms.DropEventByTime(duration_ratio=0.2),
+        "DropEventByArea(0.2)": transforms.DropEventByArea(
+            sensor_size=sensor_size, area_ratio=0.2
+        ),
+        "EventDrop": transforms.EventDrop(sensor_size=sensor_size),
+    }
+
+    # random transforms are averaged over several calls, reporting the best of 5 such averages
+    print(f"{len(events)} events")
+    for name, transform in benchmarks.items():
+        np.random.seed(0)
+        duration = (
+            min(timeit.repeat(lambda: transform(events), number=10, repeat=5)) / 10
+        )
+        print(f"{name:<24}{duration * 1e3:8.2f} ms")
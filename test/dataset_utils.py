@@ -14,6 +14,11 @@ TEST_LOCATION_ON_SYSTEM = os.path.expanduser(TEST_LOCATION_ON_SYSTEM)
 class DatasetTestCase(unittest.TestCase):
     DATASET_CLASS = None
     FEATURE_TYPES = None
+    # whether the dataset supports packed=True, and which attributes are restored from the pack
+    PACKED = False
+    PACKED_ATTRIBUTES = ()
+    # whether a packed dataset is opened without checking for the downloaded files
+    PACKED_SKIPS_CHECKS = False
     _CHECK_FUNCTIONS = {"check_md5", "check_integrity", "check_exists"}
     _DOWNLOAD_EXTRACT_FUNCTIONS = {
         "download_url",
@@ -94,6 +99,34 @@ class DatasetTestCase(unittest.TestCase):
         dataset, info = self.create_dataset()
         assert len(dataset) == info["n_samples"]
 
+    def test_packed(self):
+        if not self.PACKED:
+            self.skipTest("The dataset cannot be packed.")
+        dataset, info = self.create_dataset()
+        shutil.rmtree(dataset._packed_folder(), ignore_errors=True)
+        with patch.object(self.DATASET_CLASS, "_check_exists", return_value=True):
+            packed_dataset = self.DATASET_CLASS(**self.KWARGS, packed=True)
+        with patch.object(
+            self.DATASET_CLASS,
+            "_check_exists",
+            **(
+                {"side_effect": AssertionError}
+                if self.PACKED_SKIPS_CHECKS
+                else {"return_value": True}
+            ),
+        ):
+            reopened_dataset = self.DATASET_CLASS(**self.KWARGS, packed=True)
+
+        for other in (packed_dataset, reopened_dataset):
+            assert len(other) == len(dataset)
+            for name in self.PACKED_ATTRIBUTES:
+                assert getattr(other, name) == getattr(dataset, name)
+            for (events, target), (packed_events, packed_target) in zip(dataset, other):
+                assert packed_events.dtype == events.dtype
+                assert packed_events.shape == events.shape
+                assert np.array_equal(events, packed_events)
+                assert packed_target == target
+
     @classmethod
     def setUpClass(cls):
         cls.KWARGS.update({"save_to": TEST_LOCATION_ON_SYSTEM})
@@ -1,8 +1,11 @@
 import os
+import pickle
+import shutil
 
 import dataset_utils
 import h5py
 import numpy as np
+import scipy.io
 from utils import create_random_input
 
 import tonic.datasets as datasets
@@ -16,6 +19,9 @@ class ASLDVSTestCaseTest(dataset_utils.DatasetTestCase):
     FEATURE_TYPES = (datasets.ASLDVS.dtype,)
     TARGET_TYPES = (int,)
     KWARGS = {}
+    PACKED = True
+    PACKED_ATTRIBUTES = ("targets",)
+    PACKED_SKIPS_CHECKS = True
 
     def inject_fake_data(self, tmpdir):
         testfolder = os.path.join(tmpdir, "ASLDVS/a")
@@ -30,6 +36,9 @@ class DVSGestureTestCaseTrain(dataset_utils.DatasetTestCase):
     FEATURE_TYPES = (datasets.DVSGesture.dtype,)
     TARGET_TYPES = (int,)
     KWARGS = {"train": True}
+    PACKED = True
+    PACKED_ATTRIBUTES = ("targets", "users", "lighting")
+    PACKED_SKIPS_CHECKS = True
 
     def inject_fake_data(self, tmpdir):
         testfolder = os.path.join(tmpdir, "DVSGesture/ibmGestureTrain/user24_led")
@@ -141,6 +150,9 @@ class NCaltech101TestCase(dataset_utils.DatasetTestCase):
     FEATURE_TYPES = (datasets.NCALTECH101.dtype,)
     TARGET_TYPES = (int,)
     KWARGS = {}
+    PACKED = True
+    PACKED_ATTRIBUTES = ("targets",)
+    PACKED_SKIPS_CHECKS = True
 
     def inject_fake_data(self, tmpdir):
         testfolder = os.path.join(tmpdir, "NCALTECH101/Caltech101/airplanes/")
@@ -222,6 +234,7 @@ class NTIDIGITS18TestCaseTrain(dataset_utils.DatasetTestCase):
     FEATURE_TYPES = (datasets.NTIDIGITS18.dtype,)
     TARGET_TYPES = (int,)
     KWARGS = {"train": True}
+    PACKED = True
 
     def inject_fake_data(self, tmpdir):
         testfolder = os.path.join(tmpdir, "NTIDIGITS18/")
@@ -261,6 +274,7 @@ class SHDTestCaseTrain(dataset_utils.DatasetTestCase):
     FEATURE_TYPES = (datasets.SHD.dtype,)
     TARGET_TYPES = (int,)
     KWARGS = {"train": True}
+    PACKED = True
 
     def inject_fake_data(self, tmpdir):
         testfolder = os.path.join(tmpdir, "SHD/")
@@ -268,6 +282,29 @@ class SHDTestCaseTrain(dataset_utils.DatasetTestCase):
         create_hsd_data(testfolder + "shd_train.h5", n_samples=2)
         return {"n_samples": 2}
 
+    def test_file_handles(self):
+        dataset, info = self.create_dataset()
+        file = dataset._h5_file(dataset._data_path())
+        dataset[0]
+
+        assert dataset._h5_file(dataset._data_path()) is file
+        assert "_h5_files" not in pickle.loads(pickle.dumps(dataset)).__dict__
+        dataset._close_h5_files()
+        assert not file.id.valid
+        file = dataset._h5_file(dataset._data_path())
+        with dataset_utils.patch("os.getpid", return_value=-1):
+            assert dataset._h5_file(dataset._data_path()) is not file
+
+    def test_get_many(self):
+        dataset, info = self.create_dataset()
+        samples = dataset.get_many([1, 0, 1])
+
+        assert len(samples) == 3
+        for (events, target), index in zip(samples, [1, 0, 1]):
+            expected_events, expected_target = dataset[index]
+            assert np.array_equal(events, expected_events)
+            assert target == expected_target
+
 
 class SHDTestCaseTest(dataset_utils.DatasetTestCase):
     DATASET_CLASS = datasets.SHD
@@ -319,3 +356,133 @@ class SSCTestCaseTest(dataset_utils.DatasetTestCase):
         os.makedirs(testfolder, exist_ok=True)
         create_hsd_data(testfolder + "ssc_test.h5", n_samples=5)
         return {"n_samples": 5}
+
+
+def test_nmnist_packed(tmp_path):
+    # x, y, polarity bit and 23 bit timestamp of three events
+    raw_data = bytes([3, 4, 128, 0, 5, 7, 8, 0, 0, 9, 33, 1, 0x80, 0x10, 0x00])
+    for digit in (1, 2):
+        os.makedirs(tmp_path / "NMNIST" / "Test" / str(digit))
+        (tmp_path / "NMNIST" / "Test" / str(digit) / "00001.bin").write_bytes(
+            raw_data[: 5 * digit]
+        )
+
+    with dataset_utils.patch.object(
+        datasets.NMNIST, "_check_exists", return_value=True
+    ):
+        dataset = datasets.NMNIST(tmp_path, train=False)
+        packed_dataset = datasets.NMNIST(tmp_path, train=False, packed=True)
+    samples = list(dataset)
+    shutil.rmtree(tmp_path / "NMNIST" / "Test")
+    reopened_dataset = datasets.NMNIST(tmp_path, train=False, packed=True)
+
+    for other in (packed_dataset, reopened_dataset):
+        assert other.targets == [1, 2]
+        for (events, target), (packed_events, packed_target) in zip(
+            samples, other
+        ):
+            assert packed_events.dtype == events.dtype
+            assert np.array_equal(events, packed_events)
+            assert packed_target == target
+
+
+def test_asldvs_packed(tmp_path):
+    # events are stored as column vectors, which makes the samples two-dimensional
+    for letter, n_events in (("a", 3), ("b", 0)):
+        os.makedirs(tmp_path / "ASLDVS" / letter)
+        scipy.io.savemat(
+            tmp_path / "ASLDVS" / letter / f"{letter}_0001.mat",
+            {
+                name: np.arange(n_events, dtype=np.int64).reshape(-1, 1)
+                for name in ("ts", "x", "y", "pol")
+            },
+        )
+
+    with dataset_utils.patch.object(
+        datasets.ASLDVS, "_check_exists", return_value=True
+    ):
+        dataset = datasets.ASLDVS(tmp_path)
+        packed_dataset = datasets.ASLDVS(tmp_path, packed=True)
+
+    assert packed_dataset.targets == [0, 1]
+    assert packed_dataset._packed.metadata["shapes"].tolist() == [[3, 1], [0, 1]]
+    for (events, target), (packed_events, packed_target) in zip(
+        dataset, packed_dataset
+    ):
+        assert packed_events.shape == events.shape
+        assert np.array_equal(events, packed_events)
+        assert packed_target == target
+
+
+def test_packed_keeps_bool_polarity(tmp_path):
+    folder = tmp_path / "DVSGesture" / "ibmGestureTrain" / "user01_led"
+    os.makedirs(folder)
+    np.save(folder / "0.npy", np.array([[1, 2, 1, 5], [3, 4, 0, 6]]))
+
+    with dataset_utils.patch.object(
+        datasets.DVSGesture, "_check_exists", return_value=True
+    ):
+        dataset = datasets.DVSGesture(tmp_path)
+        packed_dataset = datasets.DVSGesture(tmp_path, packed=True)
+
+    packed_dtype = packed_dataset._packed.fields["events"].dtype
+    assert packed_dtype["p"] == np.dtype(bool)
+    assert packed_dtype["x"] == np.int16 and packed_dtype["t"] == np.int32
+    assert packed_dataset[0][0].dtype == datasets.DVSGesture.dtype
+    assert np.array_equal(dataset[0][0], packed_dataset[0][0])
+
+
+def test_packed_keeps_dtype_of_large_values(tmp_path):
+    folder = tmp_path / "DVSGesture" / "ibmGestureTrain" / "user01_led"
+    os.makedirs(folder)
+    # x, y, p and a timestamp in ms that does not fit into int32 once converted to us
+    np.save(folder / "0.npy", np.array([[1, 2, 1, 5], [3, 4, 0, 3_000_000]]))
+
+    with dataset_utils.patch.object(
+        datasets.DVSGesture, "_check_exists", return_value=True
+    ):
+        dataset = datasets.DVSGesture(tmp_path)
+        packed_dataset = datasets.DVSGesture(tmp_path, packed=True)
+
+    assert packed_dataset._packed.fields["events"].dtype == datasets.DVSGesture.dtype
+    assert np.array_equal(dataset[0][0], packed_dataset[0][0])
+    # no partial folder is left behind by the first attempt
+    assert sorted(os.listdir(tmp_path / "DVSGesture")) == [
+        "ibmGestureTrain",
+        "ibmGestureTrain_packed",
+    ]
+
+
+def test_nmnist_manifest(tmp_path):
+    for digit in (3, 1):
+        os.makedirs(tmp_path / "NMNIST" / "Train" / str(digit))
+        (tmp_path / "NMNIST" / "Train" / str(digit) / "00001.bin").write_bytes(
+            bytes([3, 4, 128, 0, 5])
+        )
+
+    with dataset_utils.patch.object(
+        datasets.NMNIST, "_check_exists", return_value=True
+    ):
+        dataset = datasets.NMNIST(tmp_path)
+        with dataset_utils.patch("os.walk", side_effect=AssertionError):
+            cached_dataset = datasets.NMNIST(tmp_path)
+            # checking for the files and then listing them reads the manifest once
+            with dataset_utils.patch("numpy.load", wraps=np.load) as load:
+                assert cached_dataset._folder_contains_at_least_n_files_of_type(
+                    2, ".bin"
+                )
+                assert cached_dataset._list_files("bin") == cached_dataset.data
+            assert load.call_count == 1
+
+        with dataset_utils.patch("os.walk", wraps=os.walk) as walk:
+            dataset._list_files("bin", sort_files=False)
+            assert walk.called
+
+        (tmp_path / "NMNIST" / "Train" / "3" / "00002.bin").write_bytes(b"")
+        updated_dataset = datasets.NMNIST(tmp_path)
+
+    assert os.path.isfile(tmp_path / "NMNIST" / "Train.manifest.npz")
+    assert dataset.targets == [1, 3]
+    assert cached_dataset.data == dataset.data
+    assert cached_dataset.targets == dataset.targets
+    assert updated_dataset.targets == [1, 3, 3]
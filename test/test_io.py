@@ -1,3 +1,10 @@
+import io
+import os
+import struct
+from unittest.mock import patch
+
+import numpy as np
+
 import tonic
 
 
@@ -22,3 +29,128 @@ def test_read_aedat_events():
 
 def test_read_aedat4():
     events = tonic.io.read_aedat4("test/test_data/sample.aedat4")
+
+
+def test_read_mnist_file(tmp_path):
+    dtype = np.dtype([("x", int), ("y", int), ("t", int), ("p", int)])
+    # x, y, polarity bit and 23 bit timestamp, the second event is a timestamp overflow marker
+    raw_data = bytes([3, 4, 128, 0, 5, 0, 240, 0, 0, 0, 33, 1, 0x7F, 0xFF, 0xFF])
+
+    events = tonic.io.read_mnist_file(io.BytesIO(raw_data), dtype=dtype, is_stream=True)
+
+    assert events.tolist() == [(3, 4, 5, 1), (33, 1, 2**13 + 2**23 - 1, 0)]
+
+    bin_file = tmp_path / "sample.bin"
+    bin_file.write_bytes(raw_data)
+    out_file = tmp_path / "events.npy"
+    mapped_events = tonic.io.read_mnist_file(bin_file, dtype=dtype, out_file=out_file)
+    mapped_events.flush()
+
+    assert np.array_equal(mapped_events, events)
+    assert np.array_equal(np.load(out_file), events)
+
+
+def test_aedat_reader(tmp_path):
+    events = np.zeros(6, dtype=[("address", "<u4"), ("timeStamp", "<u4")])
+    events["address"] = np.arange(6)
+    events["timeStamp"] = [1, 2, 4, 8, 16, 32]
+    packets = [
+        struct.pack("<hhiiiiii", 1, 1, 8, 4, 0, len(packet), len(packet), len(packet))
+        + packet.tobytes()
+        for packet in (events[:4], events[4:])
+    ]
+    aedat_file = tmp_path / "sample.aedat"
+    aedat_file.write_bytes(b"#!AER-DAT3.1\r\n#!END-HEADER\r\n" + b"".join(packets))
+    index_file = tmp_path / "sample.aedat.index.npz"
+
+    reader = tonic.io.AEDATReader(aedat_file, index_file=index_file)
+
+    assert reader.data_version == 3.1
+    assert len(reader) == 6
+    assert reader.index["t_start"].tolist() == [1, 16]
+    assert np.array_equal(reader.read(), events)
+    assert np.array_equal(reader.read(start_time=3, end_time=17), events[2:5])
+    assert np.array_equal(
+        tonic.io.get_aer_events_from_file(aedat_file, 3.1, reader.data_start), events
+    )
+    assert reader.events is reader.events
+    assert np.array_equal(reader.address, events["address"])
+    with patch.object(tonic.io, "_index_aedat3_packets", side_effect=AssertionError):
+        assert np.array_equal(
+            tonic.io.AEDATReader(aedat_file, index_file=index_file).index, reader.index
+        )
+
+    # the index is rebuilt once the recording changes
+    aedat_file.write_bytes(aedat_file.read_bytes()[: -len(packets[1])])
+    assert len(tonic.io.AEDATReader(aedat_file, index_file=index_file)) == 4
+    assert len(tonic.io.AEDATReader(aedat_file, index_file=index_file)) == 4
+
+
+def test_read_davis_346(tmp_path):
+    events = np.zeros(3, dtype=[("address", ">u4"), ("timeStamp", ">u4")])
+    # y in bits 22-30, x in bits 12-21 and polarity in bit 11, both coordinates are flipped
+    events["address"] = [
+        (0 << 22) | (0 << 12),
+        (259 << 22) | (345 << 12) | 2048,
+        10 << 12,
+    ]
+    events["timeStamp"] = [5, 6, 7]
+    aedat_file = tmp_path / "sample.aedat"
+    aedat_file.write_bytes(
+        b"#!AER-DAT2.0\r\n# Creation time: System.currentTimeMillis() 42\r\n"
+        + events.tobytes()
+    )
+
+    shape, start_timestamp, xytp = tonic.io.read_davis_346(aedat_file)
+
+    assert shape == (346, 260)
+    assert start_timestamp == 42
+    assert xytp.tolist() == [
+        (345, 259, 5, False),
+        (0, 0, 6, True),
+        (335, 259, 7, False),
+    ]
+    assert np.array_equal(
+        tonic.io.decode_aer_events(events, "davis_346", chunk_size=2), xytp
+    )
+
+
+def test_packed_samples(tmp_path):
+    samples = [
+        {"times": np.array([0.5, 1.5]), "units": np.array([3, 4])},
+        {"times": np.array([]), "units": np.array([])},
+        {"times": np.array([2.5]), "units": np.array([5])},
+    ]
+    folder = str(tmp_path / "packed")
+
+    tonic.io.write_packed_samples(
+        folder,
+        iter(samples),
+        {"times": np.float16, "units": np.uint16},
+        metadata={"targets": ["a", "b", "c"]},
+    )
+    packed = tonic.io.PackedSamples(folder)
+
+    assert len(packed) == 3
+    assert packed.metadata["targets"].tolist() == ["a", "b", "c"]
+    assert np.load(tmp_path / "packed" / "times.npy").dtype == np.float16
+    for sample, packed_sample in zip(samples, [packed[0], packed[1], packed[-1]]):
+        assert packed_sample["units"].dtype == np.uint16
+        assert np.array_equal(packed_sample["times"], sample["times"])
+        assert np.array_equal(packed_sample["units"], sample["units"])
+
+
+def test_packed_samples_existing_folder(tmp_path):
+    folder = str(tmp_path / "packed")
+    dtypes = {"units": np.uint16}
+
+    tonic.io.write_packed_samples(folder, [{"units": np.array([1])}], dtypes)
+    # a folder packed by another process in the meantime is kept
+    tonic.io.write_packed_samples(folder, [{"units": np.array([2, 3])}], dtypes)
+    assert tonic.io.PackedSamples(folder)[0]["units"].tolist() == [1]
+
+    tonic.io.write_packed_samples(
+        folder, [{"units": np.array([2, 3])}], dtypes, overwrite=True
+    )
+    assert tonic.io.PackedSamples(folder)[0]["units"].tolist() == [2, 3]
+    assert os.listdir(tmp_path) == ["packed"]
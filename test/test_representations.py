@@ -3,6 +3,12 @@ import pytest
 from utils import create_random_input
 
 import tonic.transforms as transforms
+from tonic.slicers import (
+    SliceByEventBins,
+    SliceByEventCount,
+    SliceByTime,
+    SliceByTimeBins,
+)
 
 
 @pytest.mark.parametrize(
@@ -165,6 +171,40 @@ def test_representation_sparse_tensor(
     assert sparse_tensor is not orig_events
 
 
+@pytest.mark.parametrize(
+    "slicing, has_y",
+    [
+        (dict(time_window=20000, overlap=5000, include_incomplete=True), True),
+        (dict(n_event_bins=7, overlap=0.5), True),
+        (dict(n_time_bins=7), False),
+    ],
+)
+def test_representation_sparse_matches_frame(slicing, has_y):
+    sensor_size = (20, 10, 2)
+    if has_y:
+        orig_events, _ = create_random_input(sensor_size=sensor_size)
+    else:
+        orig_events, _ = create_random_input(
+            sensor_size=sensor_size,
+            dtype=np.dtype([("x", int), ("t", int), ("p", int)]),
+        )
+    frames = transforms.ToFrame(sensor_size=sensor_size, **slicing)(orig_events)
+
+    sparse_tensor = transforms.ToSparseTensor(sensor_size=sensor_size, **slicing)(
+        orig_events
+    )
+    assert sparse_tensor.is_coalesced()
+    assert np.array_equal(sparse_tensor.to_dense().numpy(), frames)
+
+    csr_frames = transforms.ToSparseTensor(
+        sensor_size=sensor_size, backend="scipy", **slicing
+    )(orig_events)
+    assert len(csr_frames) == len(frames)
+    for csr_frame, frame in zip(csr_frames, frames):
+        assert csr_frame.format == "csr"
+        assert np.array_equal(csr_frame.toarray(), frame.reshape(frame.shape[0], -1))
+
+
 def test_representation_inferred_frame():
     sensor_size = (20, 10, 2)
     orig_events, _ = create_random_input(n_events=30000, sensor_size=sensor_size)
@@ -192,6 +232,98 @@ def test_representation_audio_frame():
     assert frames.shape[1:] == (sensor_size[2], sensor_size[0])
 
 
+@pytest.mark.parametrize(
+    "slicing, slicer, has_y",
+    [
+        (
+            dict(time_window=20000, overlap=5000, include_incomplete=True),
+            SliceByTime(time_window=20000, overlap=5000, include_incomplete=True),
+            True,
+        ),
+        (
+            dict(event_count=3000, overlap=1000, include_incomplete=True),
+            SliceByEventCount(event_count=3000, overlap=1000, include_incomplete=True),
+            True,
+        ),
+        (
+            dict(n_time_bins=7, overlap=0.5),
+            SliceByTimeBins(bin_count=7, overlap=0.5),
+            True,
+        ),
+        (
+            dict(n_event_bins=7, overlap=0.5),
+            SliceByEventBins(bin_count=7, overlap=0.5),
+            True,
+        ),
+        (
+            dict(time_window=2000, start_time=-10000),
+            SliceByTime(time_window=2000, start_time=-10000),
+            True,
+        ),
+        (
+            dict(n_time_bins=7, overlap=0.5),
+            SliceByTimeBins(bin_count=7, overlap=0.5),
+            False,
+        ),
+    ],
+)
+def test_representation_frame_counts(slicing, slicer, has_y):
+    sensor_size = (20, 10, 2)
+    if has_y:
+        orig_events, _ = create_random_input(sensor_size=sensor_size)
+        channels = ("p", "y", "x")
+    else:
+        orig_events, _ = create_random_input(
+            sensor_size=sensor_size,
+            dtype=np.dtype([("x", int), ("t", int), ("p", int)]),
+        )
+        channels = ("p", "x")
+
+    transform = transforms.ToFrame(sensor_size=sensor_size, **slicing)
+    frames = transform(orig_events)
+
+    event_slices, _ = slicer.slice(orig_events, None)
+    assert len(frames) == len(event_slices)
+    for frame, event_slice in zip(frames, event_slices):
+        expected = np.zeros_like(frame)
+        np.add.at(expected, tuple(event_slice[channel] for channel in channels), 1)
+        assert np.array_equal(frame, expected)
+
+
+@pytest.mark.parametrize("dtype", [np.int16, np.uint8, bool, np.float32])
+def test_representation_frame_dtype(dtype):
+    sensor_size = (4, 3, 2)
+    orig_events, _ = create_random_input(n_events=20000, sensor_size=sensor_size)
+    reference = transforms.ToFrame(sensor_size=sensor_size, n_time_bins=2)(orig_events)
+    assert reference.max() > np.iinfo(np.uint8).max
+
+    transform = transforms.ToFrame(sensor_size=sensor_size, n_time_bins=2, dtype=dtype)
+    frames = transform(orig_events)
+
+    assert frames.dtype == dtype
+    if dtype == np.uint8:
+        assert np.array_equal(frames, np.minimum(reference, 255))
+    else:
+        assert np.array_equal(frames, reference.astype(dtype))
+
+
+def test_representation_frame_out():
+    sensor_size = (20, 10, 2)
+    transform = transforms.ToFrame(sensor_size=sensor_size, n_time_bins=5)
+    batch = np.full((2, 5, *sensor_size[::-1]), 7, dtype=np.uint8)
+    samples = [create_random_input(sensor_size=sensor_size)[0] for _ in range(2)]
+
+    for i, events in enumerate(samples):
+        frames = transform(events, out=batch[i])
+        assert np.shares_memory(frames, batch)
+
+    for i, events in enumerate(samples):
+        assert np.array_equal(batch[i], transform(events))
+
+    with pytest.raises(ValueError):
+        transform(samples[0], out=batch[:, 0])
+
+
 def test_representation_image():
     sensor_size = (100, 100, 2)
     orig_events, _ = create_random_input(n_events=10000, sensor_size=sensor_size)
@@ -226,6 +358,26 @@ def test_representation_time_surface(sensor_size, dt, tau):
     assert surfaces is not orig_events
 
 
+def test_representation_time_surface_iterate():
+    sensor_size = (20, 10, 2)
+    orig_events, _ = create_random_input(sensor_size=sensor_size, n_events=10000)
+    transform = transforms.ToTimesurface(
+        sensor_size=sensor_size, dt=10000, tau=5000, dtype=np.float32
+    )
+
+    surfaces = transform(orig_events)
+    assert surfaces.dtype == np.float32
+
+    iterated_surfaces = list(transform.iterate(orig_events))
+    assert len(iterated_surfaces) == len(surfaces)
+    assert all(surface.dtype == np.float32 for surface in iterated_surfaces)
+    assert np.array_equal(np.stack(iterated_surfaces), surfaces)
+
+    out = np.empty_like(surfaces)
+    assert transform(orig_events, out=out) is out
+    assert np.array_equal(out, surfaces)
+
+
 @pytest.mark.parametrize(
     "surface_size, cell_size, tau, decay",
     [(7, 9, 100, "lin"), (3, 4, 1000, "exp")],
@@ -254,6 +406,51 @@ def test_representation_avg_time_surface(surface_size, cell_size, tau, decay):
     assert surfaces is not orig_events
 
 
+@pytest.mark.parametrize(
+    "surface_size, cell_size, time_window, tau, decay",
+    [(7, 9, 1000, 100, "lin"), (3, 4, 5000, 1000, "exp"), (5, 10, 0, 100, "exp")],
+)
+def test_representation_avg_time_surface_engines(
+    surface_size, cell_size, time_window, tau, decay
+):
+    orig_events, sensor_size = create_random_input(
+        n_events=2000, sensor_size=(40, 30, 2)
+    )
+    orig_events["t"] //= 50
+
+    surfaces = []
+    for engine in ("vectorized", "loop"):
+        transform = transforms.ToAveragedTimesurface(
+            sensor_size=sensor_size,
+            surface_size=surface_size,
+            cell_size=cell_size,
+            time_window=time_window,
+            tau=tau,
+            decay=decay,
+            engine=engine,
+        )
+        surfaces.append(transform(orig_events))
+
+    assert surfaces[0].dtype == surfaces[1].dtype == np.float32
+    assert np.allclose(surfaces[0], surfaces[1], rtol=1e-5, atol=1e-6)
+
+
+def test_representation_avg_time_surface_invalid_polarity():
+    orig_events, sensor_size = create_random_input(sensor_size=(40, 30, 2))
+    orig_events["p"][-1] = 2
+
+    with pytest.raises(ValueError):
+        transforms.functional.to_averaged_timesurface_numpy(
+            orig_events,
+            sensor_size=sensor_size,
+            cell_size=10,
+            surface_size=5,
+            time_window=1000,
+            tau=100,
+            decay="lin",
+        )
+
+
 @pytest.mark.parametrize("n_time_bins", [10, 1])
 def test_representation_voxel_grid(n_time_bins):
     orig_events, sensor_size = create_random_input()
@@ -265,6 +462,29 @@ def test_representation_voxel_grid(n_time_bins):
     assert volume.shape == (n_time_bins, 1, *sensor_size[1::-1])
     assert volume is not orig_events
 
+    transform = transforms.ToVoxelGrid(
+        sensor_size=sensor_size, n_time_bins=n_time_bins, dtype=np.float64
+    )
+    assert transform(orig_events).dtype == np.float64
+    np.testing.assert_allclose(transform(orig_events), volume, rtol=1e-6, atol=1e-6)
+
+
+def test_representation_voxel_grid_normalize():
+    orig_events, sensor_size = create_random_input()
+    events = orig_events.copy()
+
+    transform = transforms.ToVoxelGrid(
+        sensor_size=sensor_size, n_time_bins=5, normalize=True
+    )
+
+    volume = transform(events)
+
+    assert volume.dtype == np.float32
+    assert np.array_equal(events, orig_events)
+    for time_bin in volume:
+        non_zero = time_bin[time_bin != 0]
+        assert np.isclose(non_zero.mean(), 0, atol=1e-5)
+
 
 @pytest.mark.parametrize(
     "n_frames, n_bits",
@@ -292,3 +512,24 @@ def test_bina_rep(n_frames, n_bits):
     assert frames.shape[0] == n_frames
     assert frames.shape[1:] == sensor_size[::-1]
     assert frames is not orig_events
+
+
+def test_bina_rep_codes():
+    event_frames = np.zeros((8, 1, 1, 3), dtype=np.int16)
+    event_frames[0, 0, 0, 0] = 1  # most significant bit
+    event_frames[7, 0, 0, 1] = 3  # least significant bit
+    event_frames[:, 0, 0, 2] = 2
+
+    codes = transforms.ToBinaRep(n_frames=1, n_bits=8, dtype=np.uint8)(event_frames)
+    frames = transforms.ToBinaRep(n_frames=1, n_bits=8)(event_frames)
+
+    assert codes.dtype == np.uint8
+    assert codes.flatten().tolist() == [128, 1, 255]
+    assert frames.dtype == np.float32
+    np.testing.assert_allclose(frames, codes / 255)
+    # the top bit would make the codes of signed integers negative
+    with pytest.raises(ValueError):
+        transforms.ToBinaRep(n_frames=1, n_bits=8, dtype=np.int8)(event_frames)
+    assert transforms.ToBinaRep(n_frames=1, n_bits=8, dtype=np.int16)(
+        event_frames
+    ).flatten().tolist() == [128, 1, 255]
@@ -64,3 +64,24 @@ def test_animation():
 
     frames = transform(events)
     tonic.utils.plot_animation(frames)
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_hot_pixel_mask(num_workers):
+    recordings = []
+    for _ in range(3):
+        events, sensor_size = create_random_input(sensor_size=(20, 10, 2))
+        events[::10]["x"] = 3  # every tenth event comes from the hot pixel at (3, 7)
+        events[::10]["y"] = 7
+        recordings.append(events)
+    dataset = DummyDataset(recordings, transform=lambda events: events)
+
+    mask = tonic.utils.hot_pixel_mask(
+        dataset, sensor_size, hot_pixel_frequency=100, num_workers=num_workers
+    )
+
+    assert mask.shape == (10, 20)
+    assert mask.sum() == 1 and mask[7, 3]
+    events = transforms.DropPixel(coordinates=mask)(recordings[0])
+    assert not ((events["x"] == 3) & (events["y"] == 7)).any()
+    assert len(events) > 0
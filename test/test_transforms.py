@@ -1,3 +1,4 @@
+import importlib.util
 import itertools
 
 import numpy as np
@@ -6,6 +7,13 @@ from utils import create_random_input
 
 import tonic.transforms as transforms
 
+numba_engine = pytest.param(
+    "numba",
+    marks=pytest.mark.skipif(
+        importlib.util.find_spec("numba") is None, reason="numba is not installed"
+    ),
+)
+
 
 @pytest.mark.parametrize(
     "sensor_size, size",
@@ -39,11 +47,12 @@ def test_crop_time(min, max):
         assert not events["t"][-1] > max
 
 
+@pytest.mark.parametrize("engine", ["auto", "vectorized", numba_engine, "loop"])
 @pytest.mark.parametrize("filter_time", [10000, 5000])
-def test_transform_denoise(filter_time):
+def test_transform_denoise(filter_time, engine):
     orig_events, sensor_size = create_random_input()
 
-    transform = transforms.Denoise(filter_time=filter_time)
+    transform = transforms.Denoise(filter_time=filter_time, engine=engine)
 
     events = transform(orig_events)
 
@@ -58,6 +67,23 @@ def test_transform_denoise(filter_time):
     assert events is not orig_events
 
 
+@pytest.mark.parametrize("engine", ["vectorized", numba_engine])
+@pytest.mark.parametrize("filter_time", [0, 1000, 2500.5])
+def test_denoise_engines_are_identical(filter_time, engine):
+    orig_events, sensor_size = create_random_input(sensor_size=(20, 10, 2))
+    shuffled_events = orig_events[np.random.permutation(len(orig_events))]
+
+    for events in (orig_events, shuffled_events):
+        reference = transforms.functional.denoise_numpy(
+            events, filter_time=filter_time, engine="loop"
+        )
+        denoised = transforms.functional.denoise_numpy(
+            events, filter_time=filter_time, engine=engine
+        )
+        assert denoised.dtype == reference.dtype
+        assert np.array_equal(denoised, reference)
+
+
 @pytest.mark.parametrize(
     "p",
     [
@@ -116,6 +142,24 @@ def test_transform_drop_events_by_time(duration_ratio):
     ), f"There should be no events during {duration} in the obtained sequence."
 
 
+def test_transform_drop_events_by_time_matches_mask():
+    orig_events, sensor_size = create_random_input()
+    orig_events["t"] //= 1000  # coarse integer timestamps with many duplicates
+    shuffled_events = orig_events[np.random.permutation(len(orig_events))]
+
+    for events in (orig_events, shuffled_events):
+        for duration_ratio in (0.0, 0.3):
+            np.random.seed(0)
+            dropped = transforms.DropEventByTime(duration_ratio=duration_ratio)(events)
+
+            np.random.seed(0)
+            drop_duration = events["t"].max() * duration_ratio
+            drop_start = np.random.uniform(0, events["t"].max() - drop_duration)
+            keep = (events["t"] < drop_start) | (events["t"] > drop_start + drop_duration)
+            assert dropped.dtype == events.dtype
+            assert np.array_equal(dropped, events[keep])
+
+
 @pytest.mark.parametrize(
     "area_ratio",
     [(0.1), (0.2), (0.3), (0.4), (0.5), (0.6), (0.7), (0.8), (0.9)],
@@ -165,6 +209,35 @@ def test_transform_decimation():
     assert len(events) == 100
 
 
+@pytest.mark.parametrize(
+    "dtype",
+    [
+        np.dtype([("x", int), ("y", int), ("t", int), ("p", int)]),
+        np.dtype([("x", np.int16), ("y", np.int16), ("t", np.int64), ("p", bool)]),
+        np.dtype([("x", int), ("t", int), ("p", int)]),
+    ],
+)
+def test_transform_decimation_per_pixel(dtype):
+    n = 3
+    orig_events, sensor_size = create_random_input(
+        sensor_size=(5, 4, 2), n_events=1000, dtype=dtype
+    )
+    transform = transforms.Decimation(n=n)
+    events = transform(orig_events)
+
+    assert events.dtype == orig_events.dtype
+    assert np.all(np.diff(events["t"]) >= 0), "Event order should be preserved."
+    names = ["x", "y"] if "y" in dtype.names else ["x"]
+    pixels, counts = np.unique(orig_events[names], return_counts=True)
+    decimated_pixels, decimated_counts = np.unique(events[names], return_counts=True)
+    assert np.array_equal(pixels[counts >= n], decimated_pixels)
+    assert np.array_equal(counts[counts >= n] // n, decimated_counts)
+
+    empty_events = transform(orig_events[:0])
+    assert len(empty_events) == 0
+    assert empty_events.dtype == orig_events.dtype
+
+
 def test_random_drop_pixel():
     orig_events, sensor_size = create_random_input(
         n_events=40000, sensor_size=(15, 15, 2)
@@ -223,6 +296,30 @@ def test_transform_drop_pixel(coordinates, hot_pixel_frequency):
     assert events is not orig_events
 
 
+def test_transform_drop_pixel_mask():
+    orig_events, sensor_size = create_random_input(sensor_size=(20, 20, 2))
+    coordinates = [(9, 11), (10, 12), (25, 2)]  # the last one lies outside of the sensor
+    mask = np.zeros(sensor_size[1::-1], dtype=bool)
+    mask[11, 9] = mask[12, 10] = True
+
+    events_by_coordinates = transforms.DropPixel(coordinates=coordinates)(orig_events)
+    events_by_mask = transforms.DropPixel(coordinates=mask)(orig_events)
+    events_by_small_mask = transforms.DropPixel(coordinates=mask[:13, :11])(orig_events)
+
+    expected = orig_events[~mask[orig_events["y"], orig_events["x"]]]
+    assert np.array_equal(events_by_coordinates, expected)
+    assert np.array_equal(events_by_mask, expected)
+    assert np.array_equal(events_by_small_mask, expected)
+
+    # coordinates that are changed in place after the first call are picked up
+    transform = transforms.DropPixel(coordinates=coordinates)
+    transform(orig_events)
+    coordinates.append((0, 0))
+    mask[0, 0] = True
+    expected = orig_events[~mask[orig_events["y"], orig_events["x"]]]
+    assert np.array_equal(transform(orig_events), expected)
+
+
 @pytest.mark.parametrize(
     "hot_pixel_frequency, event_max_freq",
     [(59, 60), (10, 60)],
@@ -268,6 +365,15 @@ def test_transform_drop_pixel_empty(coordinates, hot_pixel_frequency):
     assert len(events) == len(orig_events)
 
 
+@pytest.mark.parametrize("sensor_size", [None, (4, 3, 2)])
+def test_coordinates_to_mask_ignores_negative_coordinates(sensor_size):
+    mask = transforms.functional.coordinates_to_mask(
+        [(-1, 0), (0, -2), (2, 1)], sensor_size=sensor_size
+    )
+
+    assert np.argwhere(mask).tolist() == [[1, 2]]
+
+
 @pytest.mark.parametrize(
     "coordinates, hot_pixel_frequency",
     [(((199, 11), (199, 12), (11, 13)), None), (None, 5000)],
@@ -339,6 +445,55 @@ def test_transform_event_downsampling(target_size, dt, downsampling_method, nois
     assert events is not orig_events
 
 
+@pytest.mark.parametrize("engine", ["vectorized", numba_engine])
+def test_transform_event_downsampling_integrator(engine):
+    dtype = np.dtype([("x", int), ("y", int), ("t", int), ("p", int)])
+    # three ON events at pixel (0, 0) in the first, second and fourth ms, one OFF event at (1, 0)
+    events = np.array(
+        [(0, 0, 0, 1), (1, 0, 500, 0), (0, 0, 1000, 1), (0, 0, 3000, 1)], dtype=dtype
+    )
+
+    transform = transforms.EventDownsampling(sensor_size=(2, 1, 2), target_size=(2, 1), dt=1,
+                                             downsampling_method="integrator", noise_threshold=2,
+                                             engine=engine)
+    downsampled = transform(events)
+
+    # the ON neuron fires at 2 events and is reset, the last ON and the OFF event stay below threshold
+    assert downsampled.tolist() == [(0, 0, 1, 1000)]
+
+
+def test_transform_event_downsampling_differentiator():
+    dtype = np.dtype([("x", int), ("y", int), ("t", int), ("p", int)])
+    # an OFF event at (1, 0) in the first ms, ON events at (0, 0) in the second and third ms
+    events = np.array([(1, 0, 0, 0), (0, 0, 1000, 1), (0, 0, 2000, 1), (0, 0, 3000, 1)], dtype=dtype)
+
+    transform = transforms.EventDownsampling(sensor_size=(2, 1, 2), target_size=(2, 1), dt=1,
+                                             downsampling_method="differentiator", noise_threshold=1,
+                                             differentiator_time_bins=1)
+    downsampled = transform(events)
+
+    # only the onset of ON spikes at (0, 0) is passed on, the decrease of OFF spikes at (1, 0) is not
+    assert downsampled.tolist() == [(0, 0, 1, 0)]
+
+
+@pytest.mark.parametrize("downsampling_method, noise_threshold, differentiator_time_bins",
+                         [("integrator", 1, None), ("integrator", 0, None), ("differentiator", 2, 3)])
+def test_transform_event_downsampling_engines_are_identical(downsampling_method, noise_threshold,
+                                                            differentiator_time_bins):
+    pytest.importorskip("numba")
+    orig_events, sensor_size = create_random_input()
+
+    downsampled = [
+        transforms.EventDownsampling(sensor_size=sensor_size, target_size=(20, 10), dt=5,
+                                     downsampling_method=downsampling_method, noise_threshold=noise_threshold,
+                                     differentiator_time_bins=differentiator_time_bins, engine=engine)(orig_events)
+        for engine in ["vectorized", "numba"]
+    ]
+
+    assert len(downsampled[0]) > 0
+    assert np.array_equal(*downsampled)
+
+
 @pytest.mark.parametrize("target_size", [(50, 50), (10, 5)])
 def test_transform_random_crop(target_size):
     orig_events, sensor_size = create_random_input()
@@ -484,6 +639,21 @@ def test_transform_refractory_period(delta):
     assert events is not orig_events
 
 
+@pytest.mark.parametrize("delta", [0, 5000, 2500.5, (2000, 5000)])
+def test_refractory_period_engines_are_identical(delta):
+    orig_events, sensor_size = create_random_input(sensor_size=(20, 10, 2))
+    orig_events["t"][:20] = 0
+    shuffled_events = orig_events[np.random.permutation(len(orig_events))]
+
+    for events in (orig_events, shuffled_events):
+        np.random.seed(0)
+        reference = transforms.RefractoryPeriod(delta=delta, engine="loop")(events)
+        np.random.seed(0)
+        filtered = transforms.RefractoryPeriod(delta=delta)(events)
+        assert filtered.dtype == reference.dtype
+        assert np.array_equal(filtered, reference)
+
+
 @pytest.mark.parametrize(
     "variance, clip_outliers", [(30, False), (100, True), (3.5, True), (0.8, False)]
 )
@@ -524,6 +694,27 @@ def test_transform_spatial_jitter(variance, clip_outliers):
     assert events is not orig_events
 
 
+def test_transform_spatial_jitter_unbiased():
+    orig_events, sensor_size = create_random_input(n_events=20000)
+    events = orig_events.copy()
+
+    transform = transforms.SpatialJitter(
+        sensor_size=sensor_size, var_x=1, var_y=4, sigma_xy=1
+    )
+    jittered_events = transform(events)
+
+    assert np.array_equal(events, orig_events)
+    shifts = np.stack(
+        (
+            jittered_events["x"] - orig_events["x"],
+            jittered_events["y"] - orig_events["y"],
+        )
+    )
+    # integer coordinates are rounded, so the shifts stay centered around zero
+    assert np.allclose(shifts.mean(1), 0, atol=0.1)
+    assert np.allclose(np.cov(shifts), [[1, 1], [1, 4]], atol=0.3)
+
+
 @pytest.mark.parametrize(
     "std, clip_negative, sort_timestamps",
     [(10, True, True), (50, False, False), (0, True, False)],
@@ -632,6 +823,22 @@ def test_transform_uniform_noise(n):
     assert events is not orig_events
 
 
+def test_transform_uniform_noise_merge():
+    orig_events, sensor_size = create_random_input()
+    orig_events["t"][:100] = orig_events["t"][0]
+    orig_events["p"] = sensor_size[2]  # marks recorded events, noise has smaller polarities
+
+    events = transforms.UniformNoise(sensor_size=sensor_size, n=5000)(orig_events)
+
+    assert np.all(np.diff(events["t"]) >= 0)
+    # the recording is merged with the noise without being reordered
+    is_noise = events["p"] < sensor_size[2]
+    assert is_noise.sum() == 5000
+    assert np.array_equal(events[~is_noise], orig_events)
+    for channel, high in zip("xy", sensor_size):
+        assert np.all((events[channel][is_noise] >= 0) & (events[channel][is_noise] < high))
+
+
 @pytest.mark.parametrize("n", [100, 0, (10, 100)])
 def test_transform_uniform_noise_empty(n):
     orig_events, sensor_size = create_random_input(n_events=0)
@@ -665,6 +872,7 @@ def test_toframe_empty():
     transform = transforms.ToFrame(sensor_size=sensor_size, n_event_bins=n_event_bins)
     frame = transform(orig_events)
     assert frame.shape == (n_event_bins, sensor_size[2], sensor_size[0], sensor_size[1])
+    assert frame.dtype == np.int16
     assert frame.sum() == 0
 
     n_time_bins = 100
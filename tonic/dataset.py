@@ -1,8 +1,13 @@
+import itertools
 import os.path
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import h5py
+import numpy as np
 
 from .download_utils import check_integrity, download_and_extract_archive
+from .io import PackedSamples, packed_outdated, write_packed_samples
 
 
 class Dataset:
@@ -25,10 +30,43 @@ class Dataset:
         self.data = []
         self.targets = []
         self.folder_name = ""
+        self._packed = None
 
     def __repr__(self):
         return self.__class__.__name__
 
+    def __getstate__(self):
+        # file handles cannot be pickled, every process opens its own
+        state = self.__dict__.copy()
+        state.pop("_h5_files", None)
+        state.pop("_h5_files_pid", None)
+        state.pop("_manifest", None)
+        return state
+
+    def __del__(self):
+        self._close_h5_files()
+
+    def _h5_file(self, path) -> h5py.File:
+        """Returns a read-only h5py handle on path that is opened on first use and then reused for
+        all samples. Handles are cached per path and per process: handles inherited through a fork
+        are never used, as HDF5 handles must not be shared between processes, and handles that
+        were closed in the meantime are reopened."""
+        if self.__dict__.get("_h5_files_pid") != os.getpid():
+            self._h5_files = {}
+            self._h5_files_pid = os.getpid()
+        path = os.fspath(path)
+        handle = self._h5_files.get(path)
+        if handle is None or not handle.id.valid:
+            handle = self._h5_files[path] = h5py.File(path, "r")
+        return handle
+
+    def _close_h5_files(self):
+        """Closes the handles that were opened by _h5_file in this process."""
+        if self.__dict__.get("_h5_files_pid") == os.getpid():
+            for handle in self._h5_files.values():
+                handle.close()
+            self._h5_files = {}
+
     def download(self) -> None:
         """Downloads from a given url, places into target folder and verifies the file hash."""
         download_and_extract_archive(
@@ -46,17 +84,197 @@ class Dataset:
         self, n_files: int, file_type: str
     ) -> bool:
         """Check if the target folder `folder_name` contains at least a minimum amount of files,
-        hinting that the original archive has probably been extracted."""
-        return (
-            len(
-                list(
-                    Path(self.location_on_system, self.folder_name).glob(
-                        f"**/*{file_type}"
-                    )
-                )
+        hinting that the original archive has probably been extracted. An up to date manifest is
+        counted instead of the folder, otherwise the search stops after n_files files.
+        """
+        manifest = self._read_manifest()
+        if manifest is not None:
+            if sum(path.endswith(file_type) for path in manifest["paths"]) >= n_files:
+                return True
+        files = Path(self.location_on_system, self.folder_name).glob(f"**/*{file_type}")
+        return len(list(itertools.islice(files, n_files))) >= n_files
+
+    def _manifest_path(self) -> str:
+        folder = os.path.join(self.location_on_system, self.folder_name)
+        return os.path.normpath(folder) + ".manifest.npz"
+
+    def _list_files(self, suffix: str, sort_files: bool = True) -> List[str]:
+        """Lists the files ending with suffix below `folder_name` in the order of an os.walk with
+        sorted directories, and sorted files if sort_files is set. The listing is stored in a
+        manifest next to the folder, together with the modification time of every directory, and
+        read back for the same arguments for as long as none of these directories changes, which
+        avoids walking the folder on every construction."""
+        manifest = self._read_manifest()
+        # the next construction has to read the manifest again
+        del self._manifest
+        if (
+            manifest is not None
+            and str(manifest["suffix"]) == suffix
+            and bool(manifest["sort_files"]) == sort_files
+        ):
+            folder = os.path.join(self.location_on_system, self.folder_name)
+            return [os.path.join(folder, path) for path in manifest["paths"]]
+
+        folder = os.path.join(self.location_on_system, self.folder_name)
+        paths = []
+        directories = []
+        directory_mtimes = []
+        for path, dirs, files in os.walk(folder):
+            directories.append(os.path.relpath(path, folder))
+            directory_mtimes.append(os.stat(path).st_mtime_ns)
+            dirs.sort()
+            if sort_files:
+                files.sort()
+            paths.extend(
+                os.path.join(path, file) for file in files if file.endswith(suffix)
+            )
+
+        if len(directories) > 0:
+            self._write_manifest(
+                suffix, sort_files, paths, directories, directory_mtimes
             )
-            >= n_files
+        return paths
+
+    def _write_manifest(self, suffix, sort_files, paths, directories, directory_mtimes):
+        folder = os.path.join(self.location_on_system, self.folder_name)
+        partial_path = f"{self._manifest_path()}.{os.getpid()}.partial"
+        try:
+            with open(partial_path, "wb") as file:
+                np.savez(
+                    file,
+                    suffix=suffix,
+                    sort_files=sort_files,
+                    paths=np.array(
+                        [os.path.relpath(path, folder) for path in paths], dtype=str
+                    ),
+                    directories=np.array(directories, dtype=str),
+                    directory_mtimes=np.array(directory_mtimes, dtype=np.int64),
+                )
+            os.replace(partial_path, self._manifest_path())
+        except OSError:
+            # the data might be on a read-only file system, in which case it is listed every time
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    def _read_manifest(self) -> Optional[Dict[str, np.ndarray]]:
+        """Returns the manifest written by _list_files if none of the directories it lists has
+        been modified since, which is the case whenever files are added, removed or renamed.
+        The result is kept until the next call of _list_files, so that a constructor that checks
+        for the files and then lists them reads the manifest only once.
+        """
+        if "_manifest" not in self.__dict__:
+            self._manifest = self._load_manifest()
+        return self._manifest
+
+    def _load_manifest(self) -> Optional[Dict[str, np.ndarray]]:
+        if not os.path.isfile(self._manifest_path()):
+            return None
+        with np.load(self._manifest_path()) as manifest:
+            manifest = dict(manifest)
+        if "sort_files" not in manifest:
+            return None  # written before the file order was recorded
+        folder = os.path.join(self.location_on_system, self.folder_name)
+        for directory, mtime in zip(
+            manifest["directories"], manifest["directory_mtimes"]
+        ):
+            try:
+                if os.stat(os.path.join(folder, directory)).st_mtime_ns != mtime:
+                    return None
+            except FileNotFoundError:
+                return None
+        return manifest
+
+    def _packed_folder(self) -> str:
+        name = f"{self.folder_name}_packed" if self.folder_name else "packed"
+        return os.path.join(self.location_on_system, name)
+
+    def _open_packed(self, source_file: Optional[str] = None) -> bool:
+        """Serves samples from the packed folder if it exists and is newer than source_file,
+        which defaults to the downloaded archive. The targets and other per-sample metadata are
+        then restored from the pack, so that the extracted files do not have to be listed.
+        Returns whether the pack is used.
+        """
+        if source_file is None:
+            source_file = os.path.join(self.location_on_system, self.filename)
+        if packed_outdated(self._packed_folder(), source_file):
+            return False
+        self._packed = PackedSamples(self._packed_folder())
+        for name, values in self._packed.metadata.items():
+            if name != "shapes":
+                setattr(self, name, values.tolist())
+        return True
+
+    def _pack(
+        self, read_events: Callable[[int], np.ndarray], metadata: Dict[str, Sequence]
+    ):
+        """Reads the events of every sample once with read_events(index) and writes them into a
+        single file in the packed folder, together with per-sample metadata such as targets.
+        Integer x, y and p are stored as int16 and integer timestamps as int32, unless a sample
+        does not fit into these types, in which case the dataset's dtype is kept. Other fields,
+        such as boolean polarities, are stored as they are."""
+        narrow_dtypes = {"x": np.int16, "y": np.int16, "p": np.int16, "t": np.int32}
+        narrowed = [
+            name
+            for name in self.dtype.names
+            if name in narrow_dtypes and self.dtype[name].kind in "iu"
+        ]
+        compact_dtype = np.dtype(
+            [
+                (name, narrow_dtypes[name] if name in narrowed else self.dtype[name])
+                for name in self.dtype.names
+            ]
         )
+        try:
+            self._pack_events(read_events, metadata, compact_dtype)
+        except OverflowError:
+            self._pack_events(read_events, metadata, self.dtype)
+
+    def _pack_events(self, read_events, metadata, dtype):
+        narrowed = [name for name in dtype.names if dtype[name] != self.dtype[name]]
+        shapes = []
+
+        def samples():
+            for index in range(len(self.data)):
+                events = read_events(index)
+                for name in narrowed:
+                    limits = np.iinfo(dtype[name])
+                    if len(events) > 0 and (
+                        events[name].min() < limits.min
+                        or events[name].max() > limits.max
+                    ):
+                        raise OverflowError(
+                            f"Values of '{name}' in sample {index} do not fit into "
+                            f"{dtype[name]}."
+                        )
+                shapes.append(events.shape)
+                yield {"events": events.reshape(-1)}
+
+        # shapes is filled while the samples are written, before the metadata is saved
+        self._pack_samples(
+            samples(), {"events": dtype}, metadata={**metadata, "shapes": shapes}
+        )
+
+    def _pack_samples(
+        self,
+        samples: Iterable[Dict[str, np.ndarray]],
+        dtypes: Dict[str, np.dtype],
+        metadata: Optional[Dict[str, Sequence]] = None,
+    ):
+        """Writes samples with write_packed_samples into the packed folder and serves them from
+        there. A folder that exists at this point is outdated and gets replaced."""
+        write_packed_samples(
+            self._packed_folder(),
+            samples,
+            dtypes,
+            metadata=metadata,
+            overwrite=os.path.isdir(self._packed_folder()),
+        )
+        self._packed = PackedSamples(self._packed_folder())
+
+    def _packed_events(self, index: int) -> np.ndarray:
+        """Returns a writable copy of the packed events of a sample with the dataset's dtype."""
+        events = self._packed[index]["events"]
+        return events.astype(self.dtype).reshape(self._packed.metadata["shapes"][index])
 
     def _check_exists(self):
         """This function is supposed to do some lightweight checking to see if the downloaded files
@@ -27,6 +27,8 @@ class ASLDVS(Dataset):
         target_transform (callable, optional): A callable of transforms to apply to the targets/labels.
         transforms (callable, optional): A callable of transforms that is applied to both data and
                                          labels at the same time.
+        packed (bool): If True, the events of all samples are packed once into a single file next to the
+                       extracted archive, from which samples are then read.
     """
 
     url = "https://www.dropbox.com/sh/ibq0jsicatn7l6r/AACNrNELV56rs1YInMWUs9CAa?dl=1"
@@ -46,6 +48,7 @@ class ASLDVS(Dataset):
         transform: Optional[Callable] = None,
         target_transform: Optional[Callable] = None,
         transforms: Optional[Callable] = None,
+        packed: bool = False,
     ):
         super().__init__(
             save_to,
@@ -54,6 +57,9 @@ class ASLDVS(Dataset):
             transforms=transforms,
         )
 
+        if packed and self._open_packed():
+            return
+
         if not self._check_exists():
             self.download()
             # extract zips within zip
@@ -71,19 +77,15 @@ class ASLDVS(Dataset):
                     self.data.append(path + "/" + file)
                     self.targets.append(self.int_classes[path[-1]])
 
+        if packed:
+            self._pack(self._read_events, {"targets": self.targets})
+
     def __getitem__(self, index: int) -> Tuple[Any, Any]:
         """
         Returns:
             (events, target) where target is index of the target class.
         """
-        events, target = scio.loadmat(self.data[index]), self.targets[index]
-        events = make_structured_array(
-            events["ts"],
-            events["x"],
-            self.sensor_size[1] - 1 - events["y"],
-            events["pol"],
-            dtype=self.dtype,
-        )
+        events, target = self._read_events(index), self.targets[index]
         if self.transform is not None:
             events = self.transform(events)
         if self.target_transform is not None:
@@ -93,7 +95,19 @@ class ASLDVS(Dataset):
         return events, target
 
     def __len__(self):
-        return len(self.data)
+        return len(self.targets)
+
+    def _read_events(self, index):
+        if self._packed is not None:
+            return self._packed_events(index)
+        events = scio.loadmat(self.data[index])
+        return make_structured_array(
+            events["ts"],
+            events["x"],
+            self.sensor_size[1] - 1 - events["y"],
+            events["pol"],
+            dtype=self.dtype,
+        )
 
     def _check_exists(self):
         return (
@@ -86,14 +86,10 @@ class CIFAR10DVS(Dataset):
             for filename in self.data_filename:
                 extract_archive(os.path.join(self.location_on_system, filename))
 
-        file_path = os.path.join(self.location_on_system, self.folder_name)
-        for path, dirs, files in os.walk(file_path):
-            dirs.sort()
-            for file in files:
-                if file.endswith("aedat4"):
-                    self.data.append(os.path.join(path, file))
-                    label_number = self.classes[os.path.basename(path)]
-                    self.targets.append(label_number)
+        for file_path in self._list_files("aedat4", sort_files=False):
+            self.data.append(file_path)
+            label_number = self.classes[os.path.basename(os.path.dirname(file_path))]
+            self.targets.append(label_number)
 
     def __getitem__(self, index):
         """
@@ -30,6 +30,8 @@ class DVSGesture(Dataset):
         target_transform (callable, optional): A callable of transforms to apply to the targets/labels.
         transforms (callable, optional): A callable of transforms that is applied to both data and
                                          labels at the same time.
+        packed (bool): If True, the events of all samples are packed once into a single file next to the
+                       extracted archive, from which samples are then read.
     """
 
     test_url = "https://figshare.com/ndownloader/files/38020584"
@@ -63,6 +65,7 @@ class DVSGesture(Dataset):
         transform: Optional[Callable] = None,
         target_transform: Optional[Callable] = None,
         transforms: Optional[Callable] = None,
+        packed: bool = False,
     ):
         super().__init__(
             save_to,
@@ -83,11 +86,14 @@ class DVSGesture(Dataset):
             self.filename = self.test_filename
             self.folder_name = "ibmGestureTest"
 
+        self.users = []
+        self.lighting = []
+        if packed and self._open_packed():
+            return
+
         if not self._check_exists():
             self.download()
 
-        self.users = []
-        self.lighting = []
         file_path = os.path.join(self.location_on_system, self.folder_name)
         for path, dirs, files in os.walk(file_path):
             rel_path = os.path.relpath(path, file_path)
@@ -102,14 +108,20 @@ class DVSGesture(Dataset):
                         self.users.append(user)
                         self.lighting.append(lighting)
 
+        if packed:
+            metadata = {
+                "targets": self.targets,
+                "users": self.users,
+                "lighting": self.lighting,
+            }
+            self._pack(self._read_events, metadata)
+
     def __getitem__(self, index):
         """
         Returns:
             a tuple of (events, target) where target is the index of the target class.
         """
-        events = np.load(self.data[index])
-        events[:, 3] *= 1000  # convert from ms to us
-        events = np.lib.recfunctions.unstructured_to_structured(events, self.dtype)
+        events = self._read_events(index)
         target = self.targets[index]
         if self.transform is not None:
             events = self.transform(events)
@@ -120,7 +132,14 @@ class DVSGesture(Dataset):
         return events, target
 
     def __len__(self):
-        return len(self.data)
+        return len(self.targets)
+
+    def _read_events(self, index):
+        if self._packed is not None:
+            return self._packed_events(index)
+        events = np.load(self.data[index])
+        events[:, 3] *= 1000  # convert from ms to us
+        return np.lib.recfunctions.unstructured_to_structured(events, self.dtype)
 
     def _check_exists(self):
         return (
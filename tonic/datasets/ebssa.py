@@ -68,15 +68,16 @@ class EBSSA(Dataset):
         if not self._check_exists():
             self.download()
 
-        file = h5py.File(Path(self.location_on_system) / self.file_name, "r")
-        self.keys = list(file.keys())
+        # read with a temporary handle, samples are read through a handle per process
+        with h5py.File(Path(self.location_on_system) / self.file_name, "r") as file:
+            self.keys = list(file.keys())
 
     def __getitem__(self, index: int) -> Tuple[Any, Any]:
         """
         Returns:
             (events, target) where target is dict of bounding box and recording id.
         """
-        file = h5py.File(Path(self.location_on_system) / self.file_name, "r")
+        file = self._h5_file(Path(self.location_on_system) / self.file_name)
         data = file[self.keys[index]]
 
         td = data["TD"]
@@ -18,24 +18,92 @@ class HSD(Dataset):
     ordering = dtype.names
 
     def __getitem__(self, index):
-        file = h5py.File(os.path.join(self.location_on_system, self.data_filename), "r")
+        if self._packed is not None:
+            spikes = self._packed[index]
+            times, units = spikes["times"], spikes["units"]
+        else:
+            file = self._h5_file(self._data_path())
+            times, units = file["spikes/times"][index], file["spikes/units"][index]
         # adding artificial polarity of 1 and convert to microseconds
-        events = make_structured_array(
-            file["spikes/times"][index] * 1e6,
-            file["spikes/units"][index],
-            1,
-            dtype=self.dtype,
-        )
-        target = file["labels"][index].astype(int)
+        events = make_structured_array(times * 1e6, units, 1, dtype=self.dtype)
+        target = self._labels[index].astype(int)
         if self.transform is not None:
             events = self.transform(events)
         if self.target_transform is not None:
             target = self.target_transform(target)
         return events, target
 
+    def get_many(self, indices):
+        """Returns the samples at indices like [self[i] for i in indices], but reads them with a
+        single selection per dataset rather than one read per sample.
+
+        Parameters:
+            indices: sequence of sample indices.
+
+        Returns:
+            list of (events, target) tuples in the order of indices.
+        """
+        # h5py selections have to be sorted and unique
+        unique, inverse = np.unique(
+            np.asarray(indices, dtype=np.int64), return_inverse=True
+        )
+        if len(unique) == 0:
+            return []
+        if self._packed is not None:
+            all_spikes = [self._packed[i] for i in unique]
+            all_times = [spikes["times"] for spikes in all_spikes]
+            all_units = [spikes["units"] for spikes in all_spikes]
+        else:
+            file = self._h5_file(self._data_path())
+            all_times = file["spikes/times"][unique]
+            all_units = file["spikes/units"][unique]
+        all_targets = self._labels[unique].astype(int)
+
+        samples = []
+        for i in inverse:
+            events = make_structured_array(
+                all_times[i] * 1e6, all_units[i], 1, dtype=self.dtype
+            )
+            target = all_targets[i]
+            if self.transform is not None:
+                events = self.transform(events)
+            if self.target_transform is not None:
+                target = self.target_transform(target)
+            samples.append((events, target))
+        return samples
+
     def __len__(self):
-        file = h5py.File(os.path.join(self.location_on_system, self.data_filename), "r")
-        return len(file["labels"])
+        return len(self._labels)
+
+    def _data_path(self):
+        return os.path.join(self.location_on_system, self.data_filename)
+
+    def _read_metadata(self, packed):
+        # read with a temporary handle so that no handle is open before workers fork
+        with h5py.File(self._data_path(), "r") as file:
+            self.classes = file["extra/keys"][()]
+            self._speaker = file["extra/speaker"][()]
+            self._labels = file["labels"][()]
+            if packed and not self._open_packed(self._data_path()):
+                self._pack_samples(
+                    self._iterate_spikes(file),
+                    {
+                        name: h5py.check_vlen_dtype(file[f"spikes/{name}"].dtype)
+                        or file[f"spikes/{name}"].dtype
+                        for name in ("times", "units")
+                    },
+                )
+
+    def _packed_folder(self):
+        return os.path.splitext(self._data_path())[0] + "_packed"
+
+    @staticmethod
+    def _iterate_spikes(file, chunk_size=1024):
+        times, units = file["spikes/times"], file["spikes/units"]
+        for start in range(0, len(times), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            for sample_times, sample_units in zip(times[chunk], units[chunk]):
+                yield {"times": sample_times, "units": sample_units}
 
     def _check_exists(self):
         return (
@@ -61,6 +129,8 @@ class SHD(HSD):
         train (bool): If True, uses training subset, otherwise testing subset.
         transform (callable, optional): A callable of transforms to apply to the data.
         target_transform (callable, optional): A callable of transforms to apply to the targets/labels.
+        packed (bool): If True, the spikes are converted once into flat arrays in a '_packed' folder next to the
+                       .h5 file, from which samples are then read as memory-mapped slices.
 
     Returns:
         A dataset object that can be indexed or iterated over. One sample returns a tuple of (events, targets).
@@ -78,6 +148,7 @@ class SHD(HSD):
         train: bool = True,
         transform: Optional[Callable] = None,
         target_transform: Optional[Callable] = None,
+        packed: bool = False,
     ):
         super().__init__(
             save_to,
@@ -98,9 +169,7 @@ class SHD(HSD):
         if not self._check_exists():
             self.download()
 
-        file = h5py.File(os.path.join(self.location_on_system, self.data_filename), "r")
-        self.classes = file["extra/keys"][()]
-        self._speaker = file["extra/speaker"][()]
+        self._read_metadata(packed)
 
     @property
     def speaker(self):
@@ -124,6 +193,8 @@ class SSC(HSD):
         split (string): One of 'train', 'test' or 'valid'.
         transform (callable, optional): A callable of transforms to apply to the data.
         target_transform (callable, optional): A callable of transforms to apply to the targets/labels.
+        packed (bool): If True, the spikes are converted once into flat arrays in a '_packed' folder next to the
+                       .h5 file, from which samples are then read as memory-mapped slices.
 
     Returns:
         A dataset object that can be indexed or iterated over. One sample returns a tuple of (events, targets).
@@ -143,6 +214,7 @@ class SSC(HSD):
         split: str = "train",
         transform: Optional[Callable] = None,
         target_transform: Optional[Callable] = None,
+        packed: bool = False,
     ):
         super().__init__(
             save_to, transform=transform, target_transform=target_transform
@@ -165,6 +237,4 @@ class SSC(HSD):
         if not self._check_exists():
             self.download()
 
-        file = h5py.File(os.path.join(self.location_on_system, self.data_filename), "r")
-        self.classes = file["extra/keys"][()]
-        self._speaker = file["extra/speaker"][()]
+        self._read_metadata(packed)
@@ -29,6 +29,8 @@ class NCALTECH101(Dataset):
         target_transform (callable, optional): A callable of transforms to apply to the targets/labels.
         transforms (callable, optional): A callable of transforms that is applied to both data and
                                          labels at the same time.
+        packed (bool): If True, the events of all samples are packed once into a single file next to the
+                       extracted archive, from which samples are then read.
     """
 
     url = "https://data.mendeley.com/public-files/datasets/cy6cvx3ryv/files/36b5c52a-b49d-4853-addb-a836a8883e49/file_downloaded"
@@ -47,6 +49,7 @@ class NCALTECH101(Dataset):
         transform: Optional[Callable] = None,
         target_transform: Optional[Callable] = None,
         transforms: Optional[Callable] = None,
+        packed: bool = False,
     ):
         super().__init__(
             save_to,
@@ -55,24 +58,26 @@ class NCALTECH101(Dataset):
             transforms=transforms,
         )
 
+        if packed and self._open_packed():
+            return
+
         if not self._check_exists():
             self.download()
 
-        file_path = os.path.join(self.location_on_system, self.folder_name)
-        for path, dirs, files in os.walk(file_path):
-            dirs.sort()
-            for file in files:
-                if file.endswith("bin"):
-                    self.data.append(path + "/" + file)
-                    label_number = os.path.basename(path)
-                    self.targets.append(label_number)
+        for file_path in self._list_files("bin", sort_files=False):
+            self.data.append(file_path)
+            label_number = os.path.basename(os.path.dirname(file_path))
+            self.targets.append(label_number)
+
+        if packed:
+            self._pack(self._read_events, {"targets": self.targets})
 
     def __getitem__(self, index):
         """
         Returns:
             a tuple of (events, target) where target is the index of the target class.
         """
-        events = read_mnist_file(self.data[index], dtype=self.dtype)
+        events = self._read_events(index)
         target = self.targets[index]
         events["x"] -= events["x"].min()
         events["y"] -= events["y"].min()
@@ -85,7 +90,12 @@ class NCALTECH101(Dataset):
         return events, target
 
     def __len__(self):
-        return len(self.data)
+        return len(self.targets)
+
+    def _read_events(self, index):
+        if self._packed is not None:
+            return self._packed_events(index)
+        return read_mnist_file(self.data[index], dtype=self.dtype)
 
     def _check_exists(self):
         return (
@@ -32,6 +32,8 @@ class NMNIST(Dataset):
         target_transform (callable, optional): A callable of transforms to apply to the targets/labels.
         transforms (callable, optional): A callable of transforms that is applied to both data and
                                          labels at the same time.
+        packed (bool): If True, the events of all samples are packed once into a single file next to the
+                       extracted archive, from which samples are then read.
     """
 
     base_url = "https://data.mendeley.com/public-files/datasets/468j46mzdv/files/"
@@ -70,6 +72,7 @@ class NMNIST(Dataset):
         transform: Optional[Callable] = None,
         target_transform: Optional[Callable] = None,
         transforms: Optional[Callable] = None,
+        packed: bool = False,
     ):
         super().__init__(
             save_to,
@@ -92,18 +95,19 @@ class NMNIST(Dataset):
             self.file_md5 = self.test_md5
             self.folder_name = self.test_folder
 
+        if packed and self._open_packed():
+            return
+
         if not self._check_exists():
             self.download()
 
-        file_path = os.path.join(self.location_on_system, self.folder_name)
-        for path, dirs, files in os.walk(file_path):
-            dirs.sort()
-            files.sort()
-            for file in files:
-                if file.endswith("bin"):
-                    self.data.append(path + "/" + file)
-                    label_number = int(path[-1])
-                    self.targets.append(label_number)
+        for file_path in self._list_files("bin"):
+            self.data.append(file_path)
+            label_number = int(os.path.dirname(file_path)[-1])
+            self.targets.append(label_number)
+
+        if packed:
+            self._pack(self._read_events, {"targets": self.targets})
 
     def __getitem__(self, index):
         """
@@ -111,7 +115,7 @@ class NMNIST(Dataset):
             a tuple of (events, target) where target is the index of the target
             class.
         """
-        events = read_mnist_file(self.data[index], dtype=self.dtype)
+        events = self._read_events(index)
         if self.first_saccade_only:
             events = events[events["t"] < 1e5]
         if self.stabilize:
@@ -126,7 +130,12 @@ class NMNIST(Dataset):
         return events, target
 
     def __len__(self) -> int:
-        return len(self.data)
+        return len(self.targets)
+
+    def _read_events(self, index):
+        if self._packed is not None:
+            return self._packed_events(index)
+        return read_mnist_file(self.data[index], dtype=self.dtype)
 
     def _check_exists(self) -> bool:
         return (
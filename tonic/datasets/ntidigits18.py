@@ -31,6 +31,8 @@ class NTIDIGITS18(Dataset):
         single_digits (bool): If True, only returns samples with single digits (o, 1, 2, 3, 4, 5, 6, 7, 8, 9, z), with class 0 for 'o' and 11 for 'z'.
         transform (callable, optional): A callable of transforms to apply to the data.
         target_transform (callable, optional): A callable of transforms to apply to the targets/labels.
+        packed (bool): If True, the spikes of the partition are converted once into flat arrays in a '_packed'
+                       folder next to the .hdf5 file, from which samples are then read as memory-mapped slices.
 
     Returns:
         A dataset object that can be indexed or iterated over. One sample returns a tuple of (events, targets).
@@ -64,6 +66,7 @@ class NTIDIGITS18(Dataset):
             single_digits=False,
             transform: Optional[Callable] = None,
             target_transform: Optional[Callable] = None,
+            packed: bool = False,
     ):
         super().__init__(
             save_to,
@@ -78,17 +81,23 @@ class NTIDIGITS18(Dataset):
         if not self._check_exists():
             self.download()
 
-        self.data = h5py.File(self.file_path, 'r')
         self.partition = "train" if train else "test"
-        self.single_indices = [i for i in range(len(self.data[f"{self.partition}_labels"])) if
-                               len(self.data[f"{self.partition}_labels"][i].decode().split("-")[-1]) == 1]
-        self._samples = [x.decode() for x in self.data[f"{self.partition}_labels"]]
+        # read with a temporary handle, samples are read through a handle per process
+        with h5py.File(self.file_path, 'r') as file:
+            sample_ids = [x.decode() for x in file[f"{self.partition}_labels"]]
+            if packed and not self._open_packed():
+                self._pack_samples(self._iterate_spikes(file, sample_ids), self._spike_dtypes(file))
+
+        self.single_indices = [i for i, sample_id in enumerate(sample_ids) if len(sample_id.split("-")[-1]) == 1]
+        self._samples = sample_ids
+        self._positions = list(range(len(self._samples)))
         self.single_digits = single_digits
 
         if single_digits:
             self._samples = [self._samples[i] for i in self.single_indices]
+            self._positions = self.single_indices
 
-        self.labels = [x.decode().split("-")[-1] for x in self.data[f"{self.partition}_labels"]]
+        self.labels = [sample_id.split("-")[-1] for sample_id in sample_ids]
 
     def download(self) -> None:
         response = requests.get(self.base_url, stream=True)
@@ -115,8 +124,13 @@ class NTIDIGITS18(Dataset):
             response.raise_for_status()
     def __getitem__(self, index):
         sample_id = self._samples[index]
-        x = np.asarray(self.data[f"{self.partition}_addresses"][sample_id])
-        t = np.asarray(self.data[f"{self.partition}_timestamps"][sample_id])
+        if self._packed is not None:
+            spikes = self._packed[self._positions[index]]
+            x, t = spikes["addresses"], spikes["timestamps"]
+        else:
+            file = self._h5_file(self.file_path)
+            x = np.asarray(file[f"{self.partition}_addresses"][sample_id])
+            t = np.asarray(file[f"{self.partition}_timestamps"][sample_id])
         events = make_structured_array(
             t * 1e6,
             x,
@@ -139,6 +153,22 @@ class NTIDIGITS18(Dataset):
     def __len__(self):
         return len(self._samples)
 
+    def _packed_folder(self):
+        return os.path.join(self.location_on_system, f"n-tidigits_{self.partition}_packed")
+
+    def _spike_dtypes(self, file):
+        return {
+            name: next(iter(file[f"{self.partition}_{name}"].values())).dtype
+            for name in ("addresses", "timestamps")
+        }
+
+    def _iterate_spikes(self, file, sample_ids):
+        for sample_id in sample_ids:
+            yield {
+                name: file[f"{self.partition}_{name}"][sample_id][()]
+                for name in ("addresses", "timestamps")
+            }
+
     def _check_exists(self):
         return (
             self._is_file_present()
@@ -3,9 +3,12 @@ from .decimate import decimate_numpy
 from .denoise import denoise_numpy
 from .drop_event import drop_by_area_numpy, drop_by_time_numpy, drop_event_numpy
 from .drop_pixel import (
+    coordinates_to_mask,
+    count_pixel_events,
     drop_pixel_numpy,
     drop_pixel_raster,
     identify_hot_pixel,
+    identify_hot_pixel_mask,
     identify_hot_pixel_raster,
 )
 from .event_downsampling import (
@@ -18,8 +21,8 @@ from .time_jitter import time_jitter_numpy
 from .time_skew import time_skew_numpy
 from .to_averaged_timesurface import to_averaged_timesurface_numpy
 from .to_bina_rep import to_bina_rep_numpy
-from .to_frame import to_frame_numpy
-from .to_timesurface import to_timesurface_numpy
+from .to_frame import to_frame_numpy, to_sparse_frame_numpy
+from .to_timesurface import to_timesurface_iterator, to_timesurface_numpy
 from .to_voxel_grid import to_voxel_grid_numpy
 from .uniform_noise import uniform_noise_numpy
 
@@ -31,6 +34,9 @@ __all__ = [
     "drop_by_area_numpy",
     "drop_by_time_numpy",
     "drop_pixel_numpy",
+    "coordinates_to_mask",
+    "identify_hot_pixel_mask",
+    "count_pixel_events",
     "refractory_period_numpy",
     "spatial_jitter_numpy",
     "spatial_resize_numpy",
@@ -38,7 +44,9 @@ __all__ = [
     "time_skew_numpy",
     "to_averaged_timesurface_numpy",
     "to_frame_numpy",
+    "to_sparse_frame_numpy",
     "to_timesurface_numpy",
+    "to_timesurface_iterator",
     "to_voxel_grid_numpy",
     "to_bina_rep_numpy",
     "uniform_noise_numpy",
@@ -1,5 +1,7 @@
 import numpy as np
 
+from .utils import sort_by_pixel
+
 
 def decimate_numpy(events: np.ndarray, n: int):
     """Returns 1/n events for each pixel location.
@@ -12,26 +14,23 @@ def decimate_numpy(events: np.ndarray, n: int):
     assert "x" in events.dtype.names
     assert n > 0, "n has to be an integer greater than zero."
 
-    max_x = np.max(events["x"])
+    if len(events) == 0:
+        return events.copy()
 
-    output_events = []
+    pixel = events["x"].astype(np.int64)
     if "y" in events.dtype.names:
-        max_y = np.max(events["y"])
-        memory = np.zeros((max_x + 1, max_y + 1))
-
-        for event in events:
-            memory[event["x"], event["y"]] += 1
-            if memory[event["x"], event["y"]] >= n:
-                memory[event["x"], event["y"]] = 0
-                output_events.append(event)
+        y = events["y"].astype(np.int64)
+        pixel = pixel * (int(y.max()) + 1) + y
 
-    else:
-        memory = np.zeros((max_x + 1))
+    order, sorted_pixel = sort_by_pixel(pixel)
+    del pixel
 
-        for event in events:
-            memory[event["x"]] += 1
-            if memory[event["x"]] >= n:
-                memory[event["x"]] = 0
-                output_events.append(event)
+    # rank of every event within its pixel, every n-th one of which is kept
+    rank = np.arange(len(events))
+    group_start = np.ones(len(events), dtype=bool)
+    group_start[1:] = sorted_pixel[1:] != sorted_pixel[:-1]
+    rank -= np.maximum.accumulate(np.where(group_start, rank, 0))
 
-    return np.array(output_events)
+    keep = np.zeros(len(events), dtype=bool)
+    keep[order[rank % n == n - 1]] = True
+    return events[keep]
@@ -2,6 +2,8 @@ from typing import Tuple, Union
 
 import numpy as np
 
+from .utils import as_records
+
 
 def drop_event_numpy(events: np.ndarray, drop_probability: float):
     """Randomly drops events with drop_probability.
@@ -16,8 +18,27 @@ def drop_event_numpy(events: np.ndarray, drop_probability: float):
 
     n_events = events.shape[0]
     n_dropped_events = int(drop_probability * n_events + 0.5)
-    dropped_event_indices = np.random.choice(n_events, n_dropped_events, replace=False)
-    return np.delete(events, dropped_event_indices, axis=0)
+
+    # Sample whichever of the dropped or the kept events are fewer.
+    if n_dropped_events <= n_events // 2:
+        keep = ~_random_mask(n_events, n_dropped_events)
+    else:
+        keep = _random_mask(n_events, n_events - n_dropped_events)
+    return as_records(events)[keep].view(events.dtype)
+
+
+def _random_mask(n: int, k: int):
+    """Boolean mask of length n with exactly k randomly chosen True entries. Random positions are
+    drawn until k distinct ones are found, which is O(k) for k <= n/2, unlike
+    np.random.choice(n, k, replace=False) which permutes all n indices."""
+    mask = np.zeros(n, dtype=bool)
+    n_selected = 0
+    while n_selected < k:
+        indices = np.random.randint(0, n, k - n_selected)
+        indices = np.unique(indices[~mask[indices]])
+        mask[indices] = True
+        n_selected += len(indices)
+    return mask
 
 
 def drop_by_time_numpy(
@@ -56,11 +77,22 @@ def drop_by_time_numpy(
     drop_duration = (t_end - t_start) * duration_ratio
 
     drop_start = np.random.uniform(t_start, t_end - drop_duration)
-    mask_events = (events["t"] >= drop_start) & (
-        events["t"] <= drop_start + drop_duration
-    )
 
-    return np.delete(events, mask_events)  # remove events
+    times = events["t"]
+    if np.any(times[1:] < times[:-1]):
+        mask_events = (times >= drop_start) & (times <= drop_start + drop_duration)
+        return as_records(events)[~mask_events].view(events.dtype)
+
+    # Events are sorted in time, so the dropped ones form a contiguous block. Bounds are rounded
+    # for integer timestamps so that searchsorted does not cast all timestamps to float.
+    drop_stop = drop_start + drop_duration
+    if np.issubdtype(times.dtype, np.integer):
+        drop_start, drop_stop = np.ceil(drop_start), np.floor(drop_stop)
+    start = np.searchsorted(times, times.dtype.type(drop_start), side="left")
+    stop = np.searchsorted(times, times.dtype.type(drop_stop), side="right")
+    stop = max(start, stop)
+    records = as_records(events)
+    return np.concatenate((records[:start], records[stop:])).view(events.dtype)
 
 
 def drop_by_area_numpy(
@@ -95,7 +127,7 @@ def drop_by_area_numpy(
 
     # select ratio
     if type(area_ratio) is tuple:
-        area_ratio = np.random.uniform(area_ratio[0] and area_ratio[1])
+        area_ratio = np.random.uniform(area_ratio[0], area_ratio[1])
 
     # select area
     cut_w = int(sensor_size[0] * area_ratio)
@@ -114,4 +146,4 @@ def drop_by_area_numpy(
     )
 
     # delete events of bbox
-    return np.delete(events, mask_events)  # remove events
+    return as_records(events)[~mask_events].view(events.dtype)
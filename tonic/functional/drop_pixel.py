@@ -17,17 +17,55 @@ def identify_hot_pixel(events: np.ndarray, hot_pixel_frequency: float):
 
     assert "x" and "y" and "t" in events.dtype.names
 
-    total_time = events["t"][-1] - events["t"][0]
+    return np.argwhere(identify_hot_pixel_mask(events, hot_pixel_frequency).T)
+
+
+def identify_hot_pixel_mask(
+    events: np.ndarray, hot_pixel_frequency: float, sensor_size=None
+):
+    """Identifies pixels that fire above a certain frequency like identify_hot_pixel, but returns
+    them as a boolean mask that can be passed to drop_pixel_numpy and reused across recordings.
+
+    Parameters:
+        events: ndarray of shape [num_events, num_event_channels]
+        hot_pixel_frequency: number of spikes per pixel allowed for the recording, any pixel
+                             firing above that number will be deactivated.
+        sensor_size: x/y/p dimensions of the sensor. If None, the mask just covers all events.
 
-    hist = np.histogram2d(
-        events["x"],
-        events["y"],
-        bins=(np.arange(events["x"].max() + 2), np.arange(events["y"].max() + 2)),
-    )[0]
+    Returns:
+        boolean ndarray of shape [height, width] that is True for excessively firing pixels.
+    """
+
+    assert "x" and "y" and "t" in events.dtype.names
+
+    if sensor_size is None:
+        sensor_size = (int(events["x"].max()) + 1, int(events["y"].max()) + 1)
+    total_time = events["t"][-1] - events["t"][0]
     max_occur = hot_pixel_frequency * total_time * 1e-6
-    hot_pixels = np.asarray((hist > max_occur).nonzero()).T
 
-    return hot_pixels
+    return count_pixel_events(events, sensor_size) > max_occur
+
+
+def count_pixel_events(events: np.ndarray, sensor_size):
+    """Counts the events at every pixel.
+
+    Parameters:
+        events: ndarray of shape [num_events, num_event_channels]
+        sensor_size: x/y/p dimensions of the sensor. Events outside of the sensor are not counted.
+
+    Returns:
+        integer ndarray of shape [height, width] with the number of events at every pixel.
+    """
+    width, height = sensor_size[:2]
+    x = events["x"].astype(np.int64)
+    y = events["y"].astype(np.int64)
+    if len(events) and (
+        x.min() < 0 or y.min() < 0 or x.max() >= width or y.max() >= height
+    ):
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        x, y = x[inside], y[inside]
+
+    return np.bincount(y * width + x, minlength=width * height).reshape(height, width)
 
 
 def identify_hot_pixel_raster(events: np.ndarray, hot_pixel_frequency: float):
@@ -52,12 +90,48 @@ def identify_hot_pixel_raster(events: np.ndarray, hot_pixel_frequency: float):
     return tuple(zip(ind[:, 1], ind[:, 0]))
 
 
+def coordinates_to_mask(coordinates, sensor_size=None):
+    """Builds a boolean image of dead pixels from a list of coordinates.
+
+    Parameters:
+        coordinates: list of (x,y) coordinates that are marked in the mask. A boolean mask is
+                     returned as is.
+        sensor_size: x/y/p dimensions of the sensor. If None, the mask is just large enough to hold
+                     all coordinates. Coordinates outside of the sensor are ignored.
+
+    Returns:
+        boolean ndarray of shape [height, width] that is True at every given coordinate.
+    """
+    if isinstance(coordinates, np.ndarray) and coordinates.dtype == bool:
+        assert coordinates.ndim == 2, "Pixel masks need to have shape [height, width]."
+        return coordinates
+
+    coordinates = np.asarray(
+        [] if coordinates is None else coordinates, dtype=np.int64
+    ).reshape(-1, 2)
+    # negative coordinates would wrap around to the opposite edge of the mask
+    coordinates = coordinates[(coordinates >= 0).all(1)]
+    if sensor_size is None:
+        width, height = coordinates.max(0) + 1 if len(coordinates) else (0, 0)
+    else:
+        width, height = sensor_size[:2]
+        coordinates = coordinates[
+            (coordinates[:, 0] < width) & (coordinates[:, 1] < height)
+        ]
+
+    mask = np.zeros((height, width), dtype=bool)
+    mask[coordinates[:, 1], coordinates[:, 0]] = True
+    return mask
+
+
 def drop_pixel_numpy(events: np.ndarray, coordinates):
     """Drops events for pixel locations that fire.
 
     Parameters:
         events: ndarray of shape [num_events, num_event_channels]
-        coordinates: list of (x,y) coordinates for which all events will be deleted.
+        coordinates: list of (x,y) coordinates for which all events will be deleted, or a boolean
+                     mask of shape [height, width] that is True for pixels to be dropped, see
+                     coordinates_to_mask. Passing a mask avoids rebuilding it for every call.
 
     Returns:
         subset of original events.
@@ -65,12 +139,18 @@ def drop_pixel_numpy(events: np.ndarray, coordinates):
 
     assert "x" and "y" in events.dtype.names
 
-    dropped_pixel_mask = np.full((events.shape[0]), False, dtype=bool)
-    for x, y in coordinates:
-        current_mask = np.logical_and(events["x"] == x, events["y"] == y)
-        dropped_pixel_mask = np.logical_or(current_mask, dropped_pixel_mask)
+    mask = coordinates_to_mask(coordinates)
+    height, width = mask.shape
+
+    # Pad the mask with a row and column of live pixels that all events outside of it are mapped to.
+    padded_mask = np.zeros((height + 1, width + 1), dtype=bool)
+    padded_mask[:height, :width] = mask
+    y = events["y"].astype(np.intp)
+    x = events["x"].astype(np.intp)
+    np.clip(y, -1, height, out=y)
+    np.clip(x, -1, width, out=x)
 
-    return events[np.invert(dropped_pixel_mask)]
+    return events[~padded_mask[y, x]]
 
 
 def drop_pixel_raster(raster: np.ndarray, coordinates):
@@ -78,14 +158,17 @@ def drop_pixel_raster(raster: np.ndarray, coordinates):
 
     Parameters:
         raster: ndarray of shape [p, h, w] or [t, p, h, w]
-        coordinates: list of (x,y) coordinates for which all events will be deleted.
+        coordinates: list of (x,y) coordinates for which all events will be deleted, or a boolean
+                     mask of shape [height, width] that is True for pixels to be dropped.
 
     Returns:
         The filtered raster or frame
     """
     assert len(raster.shape) == 4 or len(raster.shape) == 3
 
-    for x, y in coordinates:
-        raster[..., y, x] = 0
+    mask = coordinates_to_mask(coordinates)
+    height = min(mask.shape[0], raster.shape[-2])
+    width = min(mask.shape[1], raster.shape[-1])
+    raster[..., :height, :width][..., mask[:height, :width]] = 0
 
     return raster
@@ -1,10 +1,12 @@
+from functools import lru_cache
+
 import numpy as np
-from numpy.lib.recfunctions import unstructured_to_structured
 
 from tonic.functional.to_frame import to_frame_numpy
 
 def differentiator_downsample(events: np.ndarray, sensor_size: tuple, target_size: tuple, dt: float, 
-                              differentiator_time_bins: int = 2, noise_threshold: int = 0):
+                              differentiator_time_bins: int = 2, noise_threshold: int = 0,
+                              engine: str = "vectorized"):
     """Spatio-temporally downsample using the integrator method coupled with a differentiator to effectively 
     downsample large object sizes relative to downsampled pixel resolution in the DVS camera's visual field.
     
@@ -20,6 +22,7 @@ def differentiator_downsample(events: np.ndarray, sensor_size: tuple, target_siz
         differentiator_time_bins (int): number of equally spaced time bins with respect to the dt 
                                         to be used for the differentiator.
         noise_threshold (int): number of events before a spike representing a new event is emitted.
+        engine (str): integrate-and-fire engine of the integrator, either 'vectorized' or 'numba'.
         
     Returns:
         the spatio-temporally downsampled input events using the differentiator method.
@@ -31,44 +34,41 @@ def differentiator_downsample(events: np.ndarray, sensor_size: tuple, target_siz
     events = events.copy()
     
     # Call integrator method
-    dt_scaling, events_integrated = integrator_downsample(events, sensor_size=sensor_size, target_size=target_size, 
-                                                          dt=(dt / differentiator_time_bins), 
-                                                          noise_threshold=noise_threshold, differentiator_call=True)
+    integrator_dt = dt / differentiator_time_bins
+    dt_scaling, spike_coordinates = integrator_downsample(events, sensor_size=sensor_size, target_size=target_size,
+                                                          dt=integrator_dt, noise_threshold=noise_threshold,
+                                                          differentiator_call=True, engine=engine)
     
     if dt_scaling:
         dt *= 1000
+        integrator_dt *= 1000
         
-    num_frames = int(events_integrated[-1][0] // dt + 1)
-    frame_histogram = np.zeros((num_frames, *np.flip(target_size), 2))
-        
-    for event in events_integrated:
-        differentiated_time, event_histogram = event
-        time = int(differentiated_time // dt)
+    # Count the spikes of every pixel and polarity within each differentiator frame. Keys are
+    # ordered by time, position and then polarity with ON events in channel 1.
+    time, polarity, y, x = spike_coordinates
+    time = (time * integrator_dt // dt).astype(int)
+    frame_size = 2 * target_size[0] * target_size[1]
+    keys, counts = np.unique(
+        ((time * target_size[1] + y) * target_size[0] + x) * 2 + (polarity == 0),
+        return_counts=True,
+    )
+    del spike_coordinates, time, polarity, y, x
         
-        # Separate events based on polarity and apply Heaviside
-        event_hist_pos = event_histogram >= noise_threshold
-        event_hist_neg = -event_histogram >= noise_threshold
+    # An event is emitted wherever the count increases from one frame to the next
+    previous_index = np.searchsorted(keys, keys - frame_size)
+    previous_counts = np.where(
+        keys[previous_index] == keys - frame_size, counts[previous_index], 0
+    )
+    keys = keys[(counts > previous_counts) & (keys >= frame_size)] - frame_size
         
-        frame_histogram[time,...,1] += event_hist_pos
-        frame_histogram[time,...,0] += event_hist_neg
+    time_index, keys = np.divmod(keys, frame_size)
+    pixel, polarity_new = np.divmod(keys, 2)
+    y_new, x_new = np.divmod(pixel, target_size[0])
         
-    # Differences between subsequent frames
-    frame_differences = (np.diff(frame_histogram, axis=0)).clip(min=0)
-    
-    # Restructuring numpy array to structured array
-    time_index, y_new, x_new, polarity_new = np.nonzero(frame_differences)
-    
-    events_new = np.column_stack((x_new, y_new, polarity_new.astype(dtype=bool), time_index * dt))
-    
-    names = ["x", "y", "p", "t"]
-    formats = ['i4', 'i4', 'i4', 'i4']
-    
-    dtype = np.dtype({'names': names, 'formats': formats})
-    
-    return unstructured_to_structured(events_new.copy(), dtype=dtype)
+    return _to_structured(x_new, y_new, polarity_new, time_index * dt)
     
 def integrator_downsample(events: np.ndarray, sensor_size: tuple, target_size: tuple, dt: float, noise_threshold: int = 0, 
-                          differentiator_call: bool = False):
+                          differentiator_call: bool = False, engine: str = "vectorized"):
     """Spatio-temporally downsample using with the following steps:
     
     1. Differencing of ON and OFF events to counter camera shake or jerk.
@@ -84,8 +84,12 @@ def integrator_downsample(events: np.ndarray, sensor_size: tuple, target_size: t
                              re-scaled to (new_width, new_height).
         dt (float): temporal resolution of events in milliseconds.
         noise_threshold (int): number of events before a spike representing a new event is emitted.
-        differentiator_call (bool): Preserve frame spikes for differentiator method in order to optimise 
-                                    differentiator method.
+        differentiator_call (bool): return the sparse spike coordinates (time, polarity, y, x) for
+                                    the differentiator method instead of events. Polarity 0 holds
+                                    the ON spikes.
+        engine (str): either 'vectorized' or 'numba'. Both integrate all pixels of the downsampled
+                      frames at once, the numba engine compiles the integrate-and-fire loop. Both
+                      produce the same output.
         
     Returns:
         the spatio-temporally downsampled input events using the integrator method.
@@ -94,9 +98,11 @@ def integrator_downsample(events: np.ndarray, sensor_size: tuple, target_size: t
     assert "x" and "y" and "t" in events.dtype.names
     assert isinstance(noise_threshold, int)
     assert dt is not None
+    assert engine in ["vectorized", "numba"]
     
     events = events.copy()
     
+    dt_scaling = False
     if np.issubdtype(events["t"].dtype, np.integer):
         dt *= 1000
         dt_scaling = True
@@ -116,42 +122,89 @@ def integrator_downsample(events: np.ndarray, sensor_size: tuple, target_size: t
     # Subtract the channels for ON/OFF differencing
     frame_histogram_diffs = all_frame_histograms[:, 1] - all_frame_histograms[:, 0]
     
-    frame_spike = np.zeros(np.flip(target_size))
-    event_histogram = []
+    frame_spikes = _integrate_and_fire(frame_histogram_diffs, noise_threshold, engine)
     
-    events_new = []
-    
-    for time, frame_histogram in enumerate(frame_histogram_diffs):
-    
-        frame_spike += frame_histogram
-            
-        coordinates_pos = np.stack(np.nonzero(np.maximum(frame_spike >= noise_threshold, 0))).T
-        coordinates_neg = np.stack(np.nonzero(np.maximum(-frame_spike >= noise_threshold, 0))).T
-        
-        if np.logical_or(coordinates_pos.size, coordinates_neg.size).sum():
-        
-            # For optimising differentiator
-            event_histogram.append((time*dt, frame_spike.copy()))
-            
-            # Reset spiking coordinates to zero
-            frame_spike[coordinates_pos[:,0], coordinates_pos[:,1]] = 0
-            frame_spike[coordinates_neg[:,0], coordinates_neg[:,1]] = 0
-            
-            # Restructure events
-            events_new.append(np.column_stack((np.flip(coordinates_pos, axis=1), np.ones((coordinates_pos.shape[0],1)).astype(dtype=bool), 
-                                                (time*dt)*np.ones((coordinates_pos.shape[0],1)))))
-            
-            events_new.append(np.column_stack((np.flip(coordinates_neg, axis=1), np.zeros((coordinates_neg.shape[0],1)).astype(dtype=bool), 
-                                                (time*dt)*np.ones((coordinates_neg.shape[0],1)))))
+    # Spikes are ordered by time, ON before OFF and then by position
+    spike_coordinates = np.unravel_index(
+        np.flatnonzero(frame_spikes), frame_spikes.shape
+    )
+    del frame_spikes
         
     if differentiator_call:
-        return dt_scaling, event_histogram
-    else:
-        events_new = np.concatenate(events_new.copy())
-        
-        names = ["x", "y", "p", "t"]
-        formats = ['i4', 'i4', 'i4', 'i4']
-        
-        dtype = np.dtype({'names': names, 'formats': formats})
+        return dt_scaling, spike_coordinates
         
-        return unstructured_to_structured(events_new.copy(), dtype=dtype)
+    time, polarity, y_new, x_new = spike_coordinates
+    return _to_structured(x_new, y_new, polarity == 0, time * dt)
+    
+def _to_structured(x, y, p, t):
+    names = ["x", "y", "p", "t"]
+    formats = ["i4", "i4", "i4", "i4"]
+
+    events = np.empty(len(x), dtype=np.dtype({"names": names, "formats": formats}))
+    events["x"] = x
+    events["y"] = y
+    events["p"] = p
+    events["t"] = t
+    return events
+
+
+def _integrate_and_fire(
+    frame_histogram_diffs: np.ndarray, noise_threshold: int, engine: str
+):
+    """Feeds the (T, H, W) differenced histograms into one integrate-and-fire neuron per pixel.
+    A neuron spikes ON (OFF) once its potential reaches noise_threshold (-noise_threshold) and
+    is reset afterwards. Returns a boolean array of shape (T, 2, H, W) with the ON spikes in
+    channel 0 and the OFF spikes in channel 1.
+    """
+    frame_spikes = np.empty(
+        (len(frame_histogram_diffs), 2, *frame_histogram_diffs.shape[1:]), dtype=bool
+    )
+
+    if engine == "numba":
+        _integrate_and_fire_kernel()(
+            frame_histogram_diffs, noise_threshold, frame_spikes
+        )
+        return frame_spikes
+
+    # Neurons reset on their own spikes, so time has to be stepped through sequentially.
+    frame_spike = np.zeros(frame_histogram_diffs.shape[1:])
+    spiked = np.empty(frame_spike.shape, dtype=bool)
+
+    for frame_histogram, (spikes_pos, spikes_neg) in zip(
+        frame_histogram_diffs, frame_spikes
+    ):
+        frame_spike += frame_histogram
+        np.greater_equal(frame_spike, noise_threshold, out=spikes_pos)
+        np.less_equal(frame_spike, -noise_threshold, out=spikes_neg)
+        np.logical_or(spikes_pos, spikes_neg, out=spiked)
+        np.copyto(frame_spike, 0, where=spiked)
+
+    return frame_spikes
+
+
+@lru_cache(maxsize=None)
+def _integrate_and_fire_kernel():
+    try:
+        import numba
+    except ImportError:
+        raise ImportError(
+            "Please install the numba package to use the numba engine. This is an optional"
+            " dependency."
+        )
+
+    @numba.njit(cache=True)
+    def kernel(frame_histogram_diffs, noise_threshold, frame_spikes):
+        n_frames, height, width = frame_histogram_diffs.shape
+        frame_spike = np.zeros((height, width))
+        for time in range(n_frames):
+            for y in range(height):
+                for x in range(width):
+                    frame_spike[y, x] += frame_histogram_diffs[time, y, x]
+                    spike_pos = frame_spike[y, x] >= noise_threshold
+                    spike_neg = frame_spike[y, x] <= -noise_threshold
+                    frame_spikes[time, 0, y, x] = spike_pos
+                    frame_spikes[time, 1, y, x] = spike_neg
+                    if spike_pos or spike_neg:
+                        frame_spike[y, x] = 0
+
+    return kernel
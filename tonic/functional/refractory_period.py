@@ -1,9 +1,12 @@
 import numpy as np
 
+from .utils import sort_by_pixel
+
 
 def refractory_period_numpy(
     events: np.ndarray,
     refractory_period: float,
+    engine: str = "vectorized",
 ):
     """Sets a refractory period for each pixel, during which events will be ignored/discarded. We
     keep events if:
@@ -11,16 +14,46 @@ def refractory_period_numpy(
         .. math::
             t_n - t_{n-1} > t_{refrac}
 
+    where :math:`t_{n-1}` is the last event seen at that pixel, regardless of whether it was kept.
+
     Parameters:
         events: ndarray of shape [num_events, num_event_channels]
         refractory_period: refractory period for each pixel in microseconds
+        engine: either 'vectorized' or 'loop'. The vectorized engine groups events by pixel and
+                compares timestamps of consecutive events, the 'loop' engine is the
+                event-by-event reference implementation. Both produce the same output.
 
     Returns:
         filtered set of events.
     """
 
     assert "t" and "x" and "y" in events.dtype.names
+    assert engine in ["vectorized", "loop"]
+
+    if len(events) == 0:
+        return events.copy()
+
+    if engine == "loop":
+        return _refractory_period_loop(events, refractory_period)
+
+    x = events["x"].astype(np.int64)
+    y = events["y"].astype(np.int64)
+    order, sorted_pixel = sort_by_pixel(x * (int(y.max()) + 1) + y)
+    sorted_times = events["t"][order]
+
+    # the timestamp memory of every pixel holds the last event seen there
+    timestamp_memory = np.empty(len(events), dtype=np.float64)
+    timestamp_memory[1:] = sorted_times[:-1]
+    first_in_pixel = np.ones(len(events), dtype=bool)
+    first_in_pixel[1:] = sorted_pixel[1:] != sorted_pixel[:-1]
+    timestamp_memory[first_in_pixel] = -refractory_period
+
+    keep = np.empty(len(events), dtype=bool)
+    keep[order] = sorted_times - timestamp_memory > refractory_period
+    return events[keep]
+
 
+def _refractory_period_loop(events, refractory_period):
     events_copy = np.zeros_like(events)
     copy_index = 0
     width = int(events["x"].max()) + 1
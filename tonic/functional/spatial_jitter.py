@@ -29,28 +29,36 @@ def spatial_jitter_numpy(
         clip_outliers: when True, events that have been jittered outside the sensor size will be dropped.
 
     Returns:
-        array of spatially jittered events.
+        array of spatially jittered events. Integer coordinates are rounded to the nearest pixel,
+        the input events are not modified.
     """
 
     assert "x" and "y" in events.dtype.names
 
-    shifts = np.random.multivariate_normal(
-        [0, 0], [[var_x, sigma_xy], [sigma_xy, var_y]], len(events)
-    )
+    # Shifts are drawn from the Cholesky factor [[scale_x, 0], [scale_xy, scale_y]] of the
+    # covariance matrix, which is much cheaper than multivariate_normal's SVD for every call.
+    scale_x = np.sqrt(var_x)
+    scale_xy = sigma_xy / scale_x if scale_x > 0 else 0.0
+    scale_y = np.sqrt(max(var_y - scale_xy**2, 0))
 
-    events["x"] = events["x"] + shifts[:, 0]
-    events["y"] = events["y"] + shifts[:, 1]
+    x, y = np.random.standard_normal((2, len(events)))
+    y *= scale_y
+    y += scale_xy * x
+    x *= scale_x
+
+    x += events["x"]
+    y += events["y"]
+    for channel, coordinates in (("x", x), ("y", y)):
+        if np.issubdtype(events.dtype[channel], np.integer):
+            np.rint(coordinates, out=coordinates)
 
     if clip_outliers:
-        events = np.delete(
-            events,
-            np.where(
-                (events["x"] < 0)
-                | (events["x"] >= sensor_size[0])
-                | (events["y"] < 0)
-                | (events["y"] >= sensor_size[1])
-            ),
-            axis=0,
-        )
+        inside = (x >= 0) & (x < sensor_size[0]) & (y >= 0) & (y < sensor_size[1])
+        events = events[inside]
+        x, y = x[inside], y[inside]
+    else:
+        events = events.copy()
 
+    events["x"] = x
+    events["y"] = y
     return events
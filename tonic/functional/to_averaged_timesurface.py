@@ -4,6 +4,11 @@ from math import ceil
 
 import numpy as np
 
+from .utils import sort_by_pixel
+
+# upper bound for the number of (event, past event) pairs that are processed at once
+_PAIRS_PER_CHUNK = 2**20
+
 
 def _get_ts(event, locmem, time_window, tau, surface_size, decay):
     rho = surface_size // 2
@@ -60,6 +65,7 @@ def to_averaged_timesurface_numpy(
     time_window,
     tau,
     decay,
+    engine="vectorized",
 ):
     """Representation that creates averaged timesurfaces for each event for one recording.
 
@@ -72,6 +78,10 @@ def to_averaged_timesurface_numpy(
         time_window (int): how far back to look for past events for the time averaging. Expressed in microseconds.
         tau (int): time constant to decay events around occuring event with. Expressed in microseconds.
         decay (str): can be either 'lin' or 'exp', corresponding to linear or exponential decay.
+        engine (str): either 'vectorized' or 'loop'. The vectorized engine groups events by cell and polarity
+                      once, restricts past events to the time window with a searchsorted and accumulates
+                      their contributions in chunks. The 'loop' engine is the event-by-event reference
+                      implementation, which compares timestamps in float32.
     Returns:
         array of histograms (numpy.Array with shape (n_cells, n_pols, surface_size, surface_size))
     """
@@ -80,6 +90,12 @@ def to_averaged_timesurface_numpy(
     assert surface_size % 2 != 0
     assert "x" and "y" and "t" and "p" in events.dtype.names
     assert decay == "lin" or decay == "exp"
+    assert engine in ["vectorized", "loop"]
+
+    if engine == "vectorized":
+        return _averaged_timesurface_vectorized(
+            events, sensor_size, cell_size, surface_size, time_window, tau, decay
+        )
 
     # Organizing the events in cells which are, then, saved as NumPy arrays.
     locmems = _map_to_locmems(events, sensor_size, cell_size)
@@ -108,3 +124,81 @@ def to_averaged_timesurface_numpy(
                 axis=0,
             ) / max(1, locmems[c][p].size)
     return hist
+
+
+def _averaged_timesurface_vectorized(
+    events, sensor_size, cell_size, surface_size, time_window, tau, decay
+):
+    w, h, npols = sensor_size
+    wgrid = ceil(w / cell_size)
+    ncells = int(wgrid * ceil(h / cell_size))
+    rho = surface_size // 2
+    hist = np.zeros(ncells * npols * surface_size**2, dtype=np.float64)
+    if len(events) == 0:
+        return hist.astype(np.float32).reshape(
+            ncells, npols, surface_size, surface_size
+        )
+    if events["p"].max() >= npols:
+        raise ValueError(
+            f"Polarities have to be smaller than the {npols} polarities of the sensor, "
+            f"got {events['p'].max()}."
+        )
+
+    # Every cell and polarity has its own local memory. Sorting by memory keeps the original order
+    # of events within each of them.
+    x = events["x"].astype(np.int64)
+    y = events["y"].astype(np.int64)
+    cell = (y // cell_size) * wgrid + x // cell_size
+    locmem = cell * npols + np.maximum(events["p"].astype(np.int64), 0)
+    order, locmem = sort_by_pixel(locmem)
+    x, y = x[order], y[order]
+    t = events["t"][order].astype(np.float64)
+
+    # Past events count if they lie in the time window. If timestamps increase within every local
+    # memory, offsetting them per memory makes them increase monotonically across memories as
+    # well, so that one searchsorted finds the first past event in the window. Otherwise, all
+    # earlier events of the memory are candidates.
+    start_t = np.maximum(t - time_window, 0)
+    index = np.arange(len(events))
+    if np.all((np.diff(t) >= 0) | (np.diff(locmem) != 0)):
+        base_t = min(t.min(), start_t.min())
+        offset = locmem * (t.max() - base_t + 1) - base_t
+        first_past = np.searchsorted(t + offset, start_t + offset)
+    else:
+        first_past = np.searchsorted(locmem, locmem)
+    n_past = np.maximum(index - first_past, 0)
+
+    # All (event, past event) pairs, in chunks of roughly _PAIRS_PER_CHUNK pairs.
+    cumulative_pairs = np.cumsum(n_past)
+    chunk_bounds = np.searchsorted(
+        cumulative_pairs,
+        np.arange(_PAIRS_PER_CHUNK, cumulative_pairs[-1], _PAIRS_PER_CHUNK),
+    )
+    for chunk in np.split(index, chunk_bounds):
+        i = np.repeat(chunk, n_past[chunk])
+        j = np.arange(len(i)) + np.repeat(
+            first_past[chunk] - np.cumsum(n_past[chunk]) + n_past[chunk], n_past[chunk]
+        )
+        ts_x, ts_y = x[j] - x[i], y[j] - y[i]
+        in_surface = (
+            (np.abs(ts_x) <= rho) & (np.abs(ts_y) <= rho) & (t[j] >= start_t[i])
+        )
+        i, j, ts_x, ts_y = (
+            i[in_surface],
+            j[in_surface],
+            ts_x[in_surface],
+            ts_y[in_surface],
+        )
+        if decay == "exp":
+            contribution = np.exp(-(t[i] - t[j]) / tau)
+        else:
+            contribution = -(t[i] - t[j]) / (3 * tau) + 1
+        flat_index = (locmem[i] * surface_size + ts_y + rho) * surface_size + ts_x + rho
+        hist += np.bincount(flat_index, weights=contribution, minlength=len(hist))
+
+    # Every event adds its own time surface at the center.
+    counts = np.bincount(locmem, minlength=ncells * npols)
+    hist = hist.reshape(ncells * npols, surface_size, surface_size)
+    hist[:, rho, rho] += counts
+    hist /= np.maximum(counts, 1)[:, None, None]
+    return hist.astype(np.float32).reshape(ncells, npols, surface_size, surface_size)
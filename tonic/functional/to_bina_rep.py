@@ -5,6 +5,7 @@ def to_bina_rep_numpy(
     event_frames: np.ndarray,
     n_frames: int = 1,
     n_bits: int = 8,
+    dtype=np.float32,
 ):
     """Representation that takes T*B binary event frames to produce a sequence of T frames of N-bit
     numbers. To do so, N binary frames are interpreted as a single frame of N-bit representation.
@@ -15,6 +16,8 @@ def to_bina_rep_numpy(
         event_frames: numpy.ndarray of shape (T*BxPxHxW). The sequence of event frames.
         n_frames (int): the number T of bina-rep frames.
         n_bits (int): the number N of bits used in the N-bit representation.
+        dtype: data type of the output. Floating point outputs are scaled to [0, 1], integer
+               outputs (e.g. np.uint8 for n_bits=8) hold the raw N-bit codes.
 
     Returns:
         (numpy.ndarray) the sequence of bina-rep event frames with dimensions (TxPxHxW).
@@ -30,15 +33,16 @@ def to_bina_rep_numpy(
             f"Got: {event_frames.shape[0]} frames. Expected: {n_frames}x{n_bits}={n_bits * n_frames} frames."
         )
 
-    event_frames = (event_frames > 0).astype(np.float32)  # get binary event_frames
-
-    bina_rep_seq = np.zeros((n_frames, *event_frames.shape[1:]), dtype=np.float32)
-
-    for i in range(n_frames):
-        frames = event_frames[i * n_bits : (i + 1) * n_bits]
-        bina_rep_frame = bina_rep(frames)
-        bina_rep_seq[i] = bina_rep_frame
+    codes = _pack_bits(
+        event_frames.reshape(n_frames, n_bits, *event_frames.shape[1:]) > 0
+    )
+    if np.issubdtype(dtype, np.integer):
+        if 2**n_bits - 1 > np.iinfo(dtype).max:
+            raise ValueError(f"{n_bits}-bit codes do not fit into {np.dtype(dtype)}.")
+        return codes.astype(dtype, copy=False)
 
+    bina_rep_seq = codes.astype(dtype)
+    bina_rep_seq /= float(2**n_bits - 1)
     return bina_rep_seq
 
 
@@ -51,11 +55,22 @@ def bina_rep(frames: np.ndarray) -> np.ndarray:
     Returns:
         numpy.ndarray: the resulting bina-rep event frame. Shape=(PxHxW)
     """
-    mask = 2 ** np.arange(frames.shape[0] - 1, -1, -1, dtype=np.float32)
-    arr_mask = [
-        mask for _ in range(frames.shape[1] * frames.shape[2] * frames.shape[3])
-    ]
-    mask = np.stack(arr_mask, axis=-1)
-    mask = np.reshape(mask, frames.shape)
-
-    return np.sum(mask * frames, 0) / (2 ** mask.shape[0] - 1)
+    return to_bina_rep_numpy(frames, n_frames=1, n_bits=frames.shape[0])[0]
+
+
+def _pack_bits(binary_frames: np.ndarray) -> np.ndarray:
+    """Interprets axis 1 of a (TxNxPxHxW) boolean array as the bits of an N-bit number, most
+    significant bit first, and returns the (TxPxHxW) array of codes."""
+    n_bits = binary_frames.shape[1]
+    if n_bits > 64:
+        weights = 2.0 ** np.arange(n_bits - 1, -1, -1)
+        return np.tensordot(weights, binary_frames, axes=(0, 1))
+
+    code_dtype = np.min_scalar_type(2**n_bits - 1)
+    codes = np.zeros(
+        (binary_frames.shape[0], *binary_frames.shape[2:]), dtype=code_dtype
+    )
+    for bit in range(n_bits):
+        codes <<= 1
+        codes |= binary_frames[:, bit]
+    return codes
@@ -1,10 +1,10 @@
 import numpy as np
 
 from tonic.slicers import (
-    slice_events_by_count,
-    slice_events_by_event_bins,
-    slice_events_by_time,
-    slice_events_by_time_bins,
+    SliceByEventBins,
+    SliceByEventCount,
+    SliceByTime,
+    SliceByTimeBins,
 )
 
 
@@ -19,6 +19,8 @@ def to_frame_numpy(
     include_incomplete=False,
     start_time=None,
     end_time=None,
+    dtype=np.int16,
+    out=None,
 ):
     """Accumulate events to frames by slicing along constant time (time_window), constant number of
     events (event_count) or constant number of frames (n_time_bins / n_event_bins).
@@ -32,12 +34,102 @@ def to_frame_numpy(
         n_event_bins (None): fixed number of frames, sliced along number of events in the recording.
         overlap (0.): overlap between frames defined either in time in us, number of events or number of bins.
         include_incomplete (False): if True, includes overhang slice when time_window or event_count is specified. Not valid for bin_count methods.
+        start_time (None): optional start time for slicing by time_window.
+        end_time (None): optional end time for slicing by time_window.
+        dtype (np.int16): data type of the frames. Integer counts saturate at the maximum value of the data type,
+                          boolean frames mark pixels with at least one event.
+        out (None): optional preallocated, C-contiguous array of shape (TxPxHxW) that the frames are written into.
+                    Its data type takes precedence over dtype.
 
     Returns:
         numpy array with dimensions (TxPxHxW)
     """
     assert "x" and "t" and "p" in events.dtype.names
 
+    flat_index, n_frames, frame_shape = _flat_frame_indices(
+        events,
+        sensor_size,
+        time_window,
+        event_count,
+        n_time_bins,
+        n_event_bins,
+        overlap,
+        include_incomplete,
+        start_time,
+        end_time,
+    )
+    frames = _allocate_frames(n_frames, frame_shape, dtype, out)
+    _count_into(frames.reshape(-1), flat_index)
+    return frames
+
+
+def to_sparse_frame_numpy(
+    events,
+    sensor_size,
+    time_window=None,
+    event_count=None,
+    n_time_bins=None,
+    n_event_bins=None,
+    overlap=0.0,
+    include_incomplete=False,
+    start_time=None,
+    end_time=None,
+):
+    """Accumulate events to frames like to_frame_numpy does, but return them in coordinate (COO)
+    format without ever creating the dense frames. Memory use is proportional to the number of
+    events rather than to the size of the frames.
+
+    Parameters:
+        events: ndarray of shape [num_events, num_event_channels]
+        sensor_size: size of the sensor that was used [W,H,P]
+        time_window (None): window length in us.
+        event_count (None): number of events per frame.
+        n_time_bins (None): fixed number of frames, sliced along time axis.
+        n_event_bins (None): fixed number of frames, sliced along number of events in the recording.
+        overlap (0.): overlap between frames defined either in time in us, number of events or number of bins.
+        include_incomplete (False): if True, includes overhang slice when time_window or event_count is specified. Not valid for bin_count methods.
+        start_time (None): optional start time for slicing by time_window.
+        end_time (None): optional end time for slicing by time_window.
+
+    Returns:
+        coordinates as an int64 array of shape [4, num_nonzero] (or [3, num_nonzero] for events without y) in
+        lexicographic order, the event count for each coordinate, and the dense shape (TxPxHxW).
+    """
+    assert "x" and "t" and "p" in events.dtype.names
+
+    flat_index, n_frames, frame_shape = _flat_frame_indices(
+        events,
+        sensor_size,
+        time_window,
+        event_count,
+        n_time_bins,
+        n_event_bins,
+        overlap,
+        include_incomplete,
+        start_time,
+        end_time,
+    )
+    shape = (n_frames, *frame_shape)
+    flat_index, counts = _count_runs(flat_index)
+    coordinates = np.stack(np.unravel_index(flat_index, shape))
+    return coordinates, counts, shape
+
+
+def _flat_frame_indices(
+    events,
+    sensor_size,
+    time_window,
+    event_count,
+    n_time_bins,
+    n_event_bins,
+    overlap,
+    include_incomplete,
+    start_time,
+    end_time,
+):
+    """Returns the linearized (frame, p, [y,] x) index of every event in every slice, together
+    with the number of frames and the shape of a single frame.
+    """
     if (
         not sum(
             param is not None
@@ -67,9 +159,13 @@ def to_frame_numpy(
             )
         events["p"] = 0
 
+    if len(events) == 0:
+        # an empty recording still yields the expected number of frames
+        n_frames = n_time_bins or n_event_bins or 1
+        return np.zeros(0, dtype=np.int64), n_frames, _frame_shape(events, sensor_size)
+
     if time_window:
-        event_slices = slice_events_by_time(
-            events,
+        slicer = SliceByTime(
             time_window,
             overlap=overlap,
             include_incomplete=include_incomplete,
@@ -77,26 +173,96 @@ def to_frame_numpy(
             end_time=end_time,
         )
     elif event_count:
-        event_slices = slice_events_by_count(
-            events, event_count, overlap=overlap, include_incomplete=include_incomplete
+        slicer = SliceByEventCount(
+            event_count, overlap=overlap, include_incomplete=include_incomplete
         )
     elif n_time_bins:
-        event_slices = slice_events_by_time_bins(events, n_time_bins, overlap=overlap)
+        slicer = SliceByTimeBins(n_time_bins, overlap=overlap)
     elif n_event_bins:
-        event_slices = slice_events_by_event_bins(events, n_event_bins, overlap=overlap)
+        slicer = SliceByEventBins(n_event_bins, overlap=overlap)
+    metadata = slicer.get_slice_metadata(events, None)
+    frame_index, event_index = _frame_and_event_indices(metadata, len(events))
 
-    if "y" in events.dtype.names:
-        frames = np.zeros((len(event_slices), *sensor_size[::-1]), dtype=np.int16)
-        for i, event_slice in enumerate(event_slices):
-            np.add.at(
-                frames,
-                (i, event_slice["p"].astype(int), event_slice["y"], event_slice["x"]),
-                1,
+    frame_shape = _frame_shape(events, sensor_size)
+    channels = ("p", "y", "x") if "y" in events.dtype.names else ("p", "x")
+
+    # linearize (frame, p, [y,] x) so that all frames are accumulated in a single pass
+    flat_index = frame_index
+    for channel, size in zip(channels, frame_shape):
+        values = events[channel][event_index].astype(np.int64)
+        if channel == "p":
+            # negative polarities index from the back, as they used to with np.add.at
+            values[values < 0] += size
+        if len(values) > 0 and (values.min() < 0 or values.max() >= size):
+            raise IndexError(
+                f"Event coordinate '{channel}' out of bounds for sensor size {sensor_size}."
             )
-    else:
-        frames = np.zeros(
-            (len(event_slices), sensor_size[2], sensor_size[0]), dtype=np.int16
+        flat_index = flat_index * size + values
+
+    return flat_index, len(metadata), frame_shape
+
+
+def _frame_shape(events, sensor_size):
+    if "y" in events.dtype.names:
+        return tuple(sensor_size[::-1])
+    return (sensor_size[2], sensor_size[0])
+
+
+def _allocate_frames(n_frames, frame_shape, dtype, out):
+    if out is None:
+        return np.zeros((n_frames, *frame_shape), dtype=dtype)
+    if out.shape != (n_frames, *frame_shape):
+        raise ValueError(
+            f"Output buffer has shape {out.shape}, but frames have shape"
+            f" {(n_frames, *frame_shape)}."
         )
-        for i, event_slice in enumerate(event_slices):
-            np.add.at(frames, (i, event_slice["p"].astype(int), event_slice["x"]), 1)
-    return frames
+    if not out.flags.c_contiguous:
+        raise ValueError("Output buffer has to be C-contiguous.")
+    out.fill(0)
+    return out
+
+
+def _count_into(frames, flat_index):
+    """Counts the occurrences of every flat index into a flat array of zeros, like
+    np.add.at(frames, flat_index, 1) would, but saturating at the maximum value of an integer
+    data type. A dense np.bincount is fastest as long as the output is not much larger than the
+    number of indices, otherwise counting runs of sorted indices avoids writing a full-size int64
+    intermediate.
+    """
+    if len(frames) <= 8 * len(flat_index):
+        index = slice(None)
+        counts = np.bincount(flat_index, minlength=len(frames))
+    else:
+        index, counts = _count_runs(flat_index)
+
+    if np.issubdtype(frames.dtype, np.integer):
+        np.minimum(counts, np.iinfo(frames.dtype).max, out=counts)
+    frames[index] = counts
+
+
+def _count_runs(flat_index):
+    """Returns the sorted unique flat indices and how often each of them occurs."""
+    flat_index = np.sort(flat_index)
+    run_starts = np.flatnonzero(np.diff(flat_index, prepend=-1))
+    return flat_index[run_starts], np.diff(run_starts, append=len(flat_index))
+
+
+def _frame_and_event_indices(metadata, n_events):
+    """Expands the (start, stop) event indices of every slice into a frame index and an event
+    index per slice member. Events that belong to several overlapping slices appear once for every
+    slice. If the slices are back to back, the event index is a plain slice so that no gather is
+    needed.
+    """
+    n_frames = len(metadata)
+    bounds = np.asarray(metadata, dtype=np.int64).reshape(n_frames, 2)
+    starts, stops = np.clip(bounds, 0, n_events).T
+    lengths = np.maximum(stops - starts, 0)
+
+    frame_index = np.repeat(np.arange(n_frames, dtype=np.int64), lengths)
+    if n_frames > 0 and np.all(starts[1:] == stops[:-1]) and np.all(stops >= starts):
+        return frame_index, slice(starts[0], stops[-1])
+
+    offsets = np.cumsum(lengths) - lengths
+    event_index = np.arange(lengths.sum(), dtype=np.int64)
+    event_index += np.repeat(starts - offsets, lengths)
+    return frame_index, event_index
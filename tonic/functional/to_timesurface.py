@@ -1,9 +1,8 @@
 from typing import Tuple
 
 import numpy as np
-from numpy.lib import recfunctions as rfn
 
-from tonic.slicers import slice_events_by_time
+from tonic.slicers import SliceByTime
 
 
 def to_timesurface_numpy(
@@ -13,6 +12,8 @@ def to_timesurface_numpy(
     tau: float,
     overlap: int = 0,
     include_incomplete: bool = False,
+    dtype=np.float64,
+    out=None,
 ):
     """Representation that creates timesurfaces for each event in the recording. Modeled after the
     paper Lagorce et al. 2016, Hots: a hierarchy of event-based time-surfaces for pattern
@@ -23,6 +24,9 @@ def to_timesurface_numpy(
         sensor_size: x/y/p dimensions of the sensor
         dt: time interval at which the time-surfaces are accumulated
         tau (float): time constant to decay events around occuring event with.
+        dtype: data type of the surfaces, np.float64 by default.
+        out: optional preallocated array of shape (n_events//dt, p, h , w) that the surfaces are
+             written into. Its data type takes precedence over dtype.
 
     Returns:
         array of timesurfaces with dimensions (n_events//dt, p, h , w)
@@ -30,23 +34,73 @@ def to_timesurface_numpy(
 
     assert dt >= 0, print("Parameter delta_t cannot be negative.")
 
-    event_slices = slice_events_by_time(
-        events, time_window=dt, overlap=overlap, include_incomplete=include_incomplete
+    metadata = SliceByTime(
+        time_window=dt, overlap=overlap, include_incomplete=include_incomplete
+    ).get_slice_metadata(events, None)
+    shape = (len(metadata), *sensor_size[::-1])
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError(
+            f"Output buffer has shape {out.shape}, but surfaces have shape {shape}."
+        )
+
+    for _ in _iterate_timesurfaces(events, metadata, sensor_size, dt, tau, out=out):
+        pass
+    return out
+
+
+def to_timesurface_iterator(
+    events,
+    sensor_size: Tuple[int, int, int],
+    dt: float,
+    tau: float,
+    overlap: int = 0,
+    include_incomplete: bool = False,
+    dtype=np.float64,
+):
+    """Generator variant of to_timesurface_numpy that yields one timesurface of shape (p, h, w) at
+    a time, so that long recordings can be processed without holding all surfaces in memory.
+
+    Parameters:
+        sensor_size: x/y/p dimensions of the sensor
+        dt: time interval at which the time-surfaces are accumulated
+        tau (float): time constant to decay events around occuring event with.
+        dtype: data type of the surfaces, np.float64 by default.
+
+    Yields:
+        timesurfaces with dimensions (p, h , w)
+    """
+
+    assert dt >= 0, print("Parameter delta_t cannot be negative.")
+
+    metadata = SliceByTime(
+        time_window=dt, overlap=overlap, include_incomplete=include_incomplete
+    ).get_slice_metadata(events, None)
+    yield from _iterate_timesurfaces(
+        events, metadata, sensor_size, dt, tau, dtype=dtype
     )
-    memory = np.ones((sensor_size[::-1]), dtype=int) * -np.inf
-    all_surfaces = []
-    x_index = event_slices[0].dtype.names.index("x")
-    y_index = event_slices[0].dtype.names.index("y")
-    p_index = event_slices[0].dtype.names.index("p")
-    t_index = event_slices[0].dtype.names.index("t")
-    start_t = event_slices[0][0][t_index]
-    for i, slice in enumerate(event_slices):
-        # structured to unstructured in order to access the indices
-        slice = rfn.structured_to_unstructured(slice, dtype=int)
-        indices = slice[:, [p_index, y_index, x_index]].T
-        timestamps = slice[:, t_index]
-        memory[tuple(indices)] = timestamps
-        diff = -((i + 1) * dt + start_t - memory)
-        surf = np.exp(diff / tau)
-        all_surfaces.append(surf)
-    return np.array(all_surfaces)
+
+
+def _iterate_timesurfaces(
+    events, metadata, sensor_size, dt, tau, dtype=np.float64, out=None
+):
+    """Updates the per-pixel timestamp memory slice by slice and yields the decayed surface
+    after each slice. Surfaces are written into out if given, the memory and a float64 scratch
+    buffer are reused across steps.
+    """
+    memory = np.full(sensor_size[::-1], -np.inf)
+    scratch = np.empty_like(memory)
+    start_t = events["t"][metadata[0][0]]
+
+    for i, (start, stop) in enumerate(metadata):
+        # coordinates and timestamps within a slice are truncated to integers
+        p, y, x, t = (
+            events[name][start:stop].astype(int, copy=False)
+            for name in ("p", "y", "x", "t")
+        )
+        memory[p, y, x] = t
+        np.subtract(memory, (i + 1) * dt + start_t, out=scratch)
+        np.divide(scratch, tau, out=scratch)
+        surface = np.empty(memory.shape, dtype=dtype) if out is None else out[i]
+        yield np.exp(scratch, out=surface)
@@ -2,15 +2,20 @@ import numpy as np
 
 
 # Code adapted from https://github.com/uzh-rpg/rpg_e2vid/blob/master/utils/inference_utils.py#L431
-def to_voxel_grid_numpy(events, sensor_size, n_time_bins=10):
+def to_voxel_grid_numpy(
+    events, sensor_size, n_time_bins=10, normalize=False, dtype=np.float32
+):
     """Build a voxel grid with bilinear interpolation in the time domain from a set of events.
     Implements the event volume from Zhu et al. 2019, Unsupervised event-based learning of optical
-    flow, depth, and egomotion.
+    flow, depth, and egomotion. The events are not modified.
 
     Parameters:
         events: ndarray of shape [num_events, num_event_channels]
         sensor_size: size of the sensor that was used [W,H].
         n_time_bins: number of bins in the temporal axis of the voxel grid.
+        normalize: if True, the non-zero voxels of each time bin are normalized to zero mean and
+                   unit standard deviation.
+        dtype: data type of the voxel grid, np.float32 by default.
 
     Returns:
         numpy array of n event volumes (n,w,h,t)
@@ -18,44 +23,44 @@ def to_voxel_grid_numpy(events, sensor_size, n_time_bins=10):
     assert "x" and "y" and "t" and "p" in events.dtype.names
     assert sensor_size[2] == 2
 
-    voxel_grid = np.zeros((n_time_bins, sensor_size[1], sensor_size[0]), float).ravel()
-
     # normalize the event timestamps so that they lie between 0 and n_time_bins
     ts = (
         n_time_bins
         * (events["t"].astype(float) - events["t"][0])
         / (events["t"][-1] - events["t"][0])
     )
-    xs = events["x"].astype(int)
-    ys = events["y"].astype(int)
-    pols = events["p"]
-    pols[pols == 0] = -1  # polarity should be +1 / -1
-
     tis = ts.astype(int)
     dts = ts - tis
-    vals_left = pols * (1.0 - dts)
-    vals_right = pols * dts
-
-    valid_indices = tis < n_time_bins
-    np.add.at(
-        voxel_grid,
-        xs[valid_indices]
-        + ys[valid_indices] * sensor_size[0]
-        + tis[valid_indices] * sensor_size[0] * sensor_size[1],
-        vals_left[valid_indices],
-    )
+    pols = events["p"].astype(float)
+    pols[pols == 0] = -1  # polarity should be +1 / -1
+    pixel_index = events["x"].astype(int) + events["y"].astype(int) * sensor_size[0]
+    bin_size = sensor_size[0] * sensor_size[1]
 
-    valid_indices = (tis + 1) < n_time_bins
-    np.add.at(
-        voxel_grid,
-        xs[valid_indices]
-        + ys[valid_indices] * sensor_size[0]
-        + (tis[valid_indices] + 1) * sensor_size[0] * sensor_size[1],
-        vals_right[valid_indices],
+    # each event contributes to its own time bin and, weighted by its distance, to the next one
+    valid_left = tis < n_time_bins
+    valid_right = (tis + 1) < n_time_bins
+    voxel_index = np.concatenate(
+        (
+            pixel_index[valid_left] + tis[valid_left] * bin_size,
+            pixel_index[valid_right] + (tis[valid_right] + 1) * bin_size,
+        )
     )
-
-    voxel_grid = np.reshape(
-        voxel_grid, (n_time_bins, 1, sensor_size[1], sensor_size[0])
+    weights = np.concatenate(
+        (
+            pols[valid_left] * (1.0 - dts[valid_left]),
+            pols[valid_right] * dts[valid_right],
+        )
     )
+    voxel_grid = np.bincount(
+        voxel_index, weights=weights, minlength=n_time_bins * bin_size
+    ).reshape(n_time_bins, 1, sensor_size[1], sensor_size[0])
+
+    if normalize:
+        for time_bin in voxel_grid:
+            nonzero = time_bin != 0
+            if nonzero.any():
+                values = time_bin[nonzero]
+                std = values.std()
+                time_bin[nonzero] = (values - values.mean()) / (std if std > 0 else 1)
 
-    return voxel_grid
+    return voxel_grid.astype(dtype, copy=False)
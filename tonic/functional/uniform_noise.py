@@ -12,16 +12,35 @@ def uniform_noise_numpy(events: np.ndarray, sensor_size: Tuple[int, int, int], n
         sensor_size: 3-tuple of integers for x, y, p
         n: the number of noise events added.
     """
+    ranges = {
+        "x": (0, sensor_size[0]),
+        "y": (0, sensor_size[1]),
+        "p": (0, sensor_size[2]),
+        "t": (events["t"].min(), events["t"].max()),
+    }
+    channels = [channel for channel in events.dtype.names if channel in ranges]
+    low, high = np.array([ranges[channel] for channel in channels], dtype=float).T
+
+    noise = np.random.random_sample((len(channels), n))
+    noise *= (high - low)[:, None]
+    noise += low[:, None]
     noise_events = np.zeros(n, dtype=events.dtype)
-    for channel in events.dtype.names:
-        if channel == "x":
-            low, high = 0, sensor_size[0]
-        if channel == "y":
-            low, high = 0, sensor_size[1]
-        if channel == "p":
-            low, high = 0, sensor_size[2]
-        if channel == "t":
-            low, high = events["t"].min(), events["t"].max()
-        noise_events[channel] = np.random.uniform(low=low, high=high, size=n)
-    noisy_events = np.concatenate((events, noise_events))
-    return noisy_events[np.argsort(noisy_events["t"])]
+    for channel, values in zip(channels, noise):
+        noise_events[channel] = values
+
+    if np.any(events["t"][1:] < events["t"][:-1]):
+        noisy_events = np.concatenate((events, noise_events))
+        return noisy_events[np.argsort(noisy_events["t"])]
+
+    # Channels are drawn independently, so sorting the noise timestamps on their own keeps them
+    # uniform. Both sorted sequences are then merged without sorting the recording again.
+    noise_events["t"].sort()
+    noise_index = np.searchsorted(events["t"], noise_events["t"], side="right")
+    noise_index += np.arange(n)
+
+    is_noise = np.zeros(len(events) + n, dtype=bool)
+    is_noise[noise_index] = True
+    noisy_events = np.empty(len(events) + n, dtype=events.dtype)
+    noisy_events[noise_index] = noise_events
+    noisy_events[~is_noise] = events
+    return noisy_events
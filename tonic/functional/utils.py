@@ -0,0 +1,36 @@
+import numpy as np
+
+
+def sort_by_pixel(pixel: np.ndarray):
+    """Stable argsort of non-negative integer pixel addresses. Every event gets the unique key
+    (pixel, index), so that a plain sort of those keys groups events by pixel while keeping their
+    original order within each pixel. This is considerably faster than np.argsort(pixel,
+    kind="stable") for large inputs.
+
+    Parameters:
+        pixel: integer array of linearized pixel addresses, one for each event.
+
+    Returns:
+        the sorting indices and the sorted pixel addresses.
+    """
+    n_events = len(pixel)
+    if n_events == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    sorted_keys = np.sort(pixel.astype(np.int64) * n_events + np.arange(n_events))
+    sorted_pixel, order = np.divmod(sorted_keys, n_events)
+    return order, sorted_pixel
+
+
+def as_records(events: np.ndarray):
+    """Views a structured array of events as opaque records of the same size. Masking, indexing
+    or concatenating such a view copies whole records at once, which is several times faster than
+    numpy's field by field copy of structured arrays. Use .view(events.dtype) to get the fields
+    back.
+
+    Parameters:
+        events: structured numpy array of events.
+
+    Returns:
+        a view of the events with a void dtype.
+    """
+    return events.view(np.dtype((np.void, events.dtype.itemsize)))
@@ -1,6 +1,8 @@
 import os
+import shutil
 import struct
-from typing import BinaryIO, Optional, Union
+import uuid
+from typing import BinaryIO, Dict, Iterable, Optional, Sequence, Union
 
 import numpy as np
 from numpy.lib import recfunctions
@@ -67,6 +69,72 @@ def read_aedat4(in_file):
     return parsed_file["events"]
 
 
+# bit layout of the address word of every sensor as {field: (shift, mask, flip)}, where flipped
+# fields are counted down from flip. Values taken from jAER (https://github.com/SensorsINI/jaer)
+aer_address_layouts = {
+    "dvs_128": {"x": (8, 0x7F, None), "y": (1, 0x7F, None), "p": (0, 0x1, None)},
+    "dvs_ibm": {"x": (17, 0x1FFF, None), "y": (2, 0x1FFF, None), "p": (1, 0x1, None)},
+    "dvs_red": {"x": (17, 0x7FFF, None), "y": (2, 0x7FFF, None), "p": (1, 0x1, None)},
+    "davis_346": {
+        "x": (12, 0x3FF, 346 - 1),
+        "y": (22, 0x1FF, 260 - 1),
+        "p": (11, 0x1, None),
+    },
+    "dvs_346mini": {
+        "x": (22, 0x1FF, None),
+        "y": (12, 0x3FF, None),
+        "p": (11, 0x1, None),
+    },
+}
+
+
+def decode_aer_events(
+    all_events: np.ndarray,
+    sensor: str,
+    chunk_size: int = 2**20,
+    out_file: Optional[str] = None,
+):
+    """Decodes the address words of aer events into x, y and p in a single pass over the events.
+    The events are processed in chunks, so that only chunk sized temporaries are allocated.
+
+    Parameters:
+        all_events: structured array with 'address' and 'timeStamp' fields, for example the
+                    memory-mapped events of an AEDATReader.
+        sensor: one of the keys of aer_address_layouts.
+        chunk_size: number of events that are decoded at a time.
+        out_file: optional path of a .npy file that the events are decoded into. The events are
+                  then returned as a memory-mapped array backed by that file, which allows to
+                  decode recordings that do not fit into memory.
+
+    Returns:
+        xytp: numpy structured array of events
+    """
+    layout = aer_address_layouts[sensor]
+    if out_file is None:
+        xytp = np.empty(len(all_events), dtype=events_struct)
+    else:
+        xytp = np.lib.format.open_memmap(
+            out_file, mode="w+", dtype=events_struct, shape=(len(all_events),)
+        )
+
+    address = np.empty(min(chunk_size, len(all_events)), dtype=np.uint32)
+    field = np.empty(len(address), dtype=np.int32)
+    for start in range(0, len(all_events), chunk_size):
+        chunk = all_events[start : start + chunk_size]
+        stop = start + len(chunk)
+        # the address is byte swapped into native order once per chunk
+        np.copyto(address[: len(chunk)], chunk["address"])
+        for name, (shift, mask, flip) in layout.items():
+            value = field[: len(chunk)]
+            np.right_shift(address[: len(chunk)], shift, out=value)
+            np.bitwise_and(value, mask, out=value)
+            if flip is not None:
+                np.subtract(flip, value, out=value)
+            xytp[name][start:stop] = value
+        xytp["t"][start:stop] = chunk["timeStamp"]
+    return xytp
+
+
 def read_dvs_128(filename):
     """Get the aer events from DVS with resolution of rows and cols are (128, 128)
 
@@ -78,16 +146,7 @@ def read_dvs_128(filename):
             (height, width) of the sensor array
         xytp: numpy structured array of events
     """
-    data_version, data_start = read_aedat_header_from_file(filename)
-    all_events = get_aer_events_from_file(filename, data_version, data_start)
-    all_addr = all_events["address"]
-    t = all_events["timeStamp"]
-
-    x = (all_addr >> 8) & 0x007F
-    y = (all_addr >> 1) & 0x007F
-    p = all_addr & 0x1
-
-    xytp = make_structured_array(x, y, t, p)
+    xytp = decode_aer_events(AEDATReader(filename).events, "dvs_128")
     shape = (128, 128)
     return shape, xytp
 
@@ -103,16 +162,7 @@ def read_dvs_ibm(filename):
             (height, width) of the sensor array
         xytp: numpy structured array of events
     """
-    data_version, data_start = read_aedat_header_from_file(filename)
-    all_events = get_aer_events_from_file(filename, data_version, data_start)
-    all_addr = all_events["address"]
-    t = all_events["timeStamp"]
-
-    x = (all_addr >> 17) & 0x00001FFF
-    y = (all_addr >> 2) & 0x00001FFF
-    p = (all_addr >> 1) & 0x00000001
-
-    xytp = make_structured_array(x, y, t, p)
+    xytp = decode_aer_events(AEDATReader(filename).events, "dvs_ibm")
     shape = (128, 128)
     return shape, xytp
 
@@ -129,16 +179,7 @@ def read_dvs_red(filename):
 
         events: numpy structured array of events
     """
-    data_version, data_start = read_aedat_header_from_file(filename)
-    all_events = get_aer_events_from_file(filename, data_version, data_start)
-    all_addr = all_events["address"]
-    t = all_events["timeStamp"]
-
-    x = (all_addr >> 17) & 0x7FFF
-    y = (all_addr >> 2) & 0x7FFF
-    p = (all_addr >> 1) & 0x1
-
-    xytp = make_structured_array(x, y, t, p)
+    xytp = decode_aer_events(AEDATReader(filename).events, "dvs_red")
     shape = (346, 260)
     return shape, xytp
 
@@ -155,19 +196,10 @@ def read_davis_346(filename):
 
         events: numpy structured array of events
     """
-    data_version, data_start, start_timestamp = read_aedat_header_from_file(filename)
-    all_events = get_aer_events_from_file(filename, data_version, data_start)
-    all_addr = all_events["address"]
-    t = all_events["timeStamp"]
-
-    # x, y, and p : bit-shift and bit-mask values taken from jAER (https://github.com/SensorsINI/jaer)
-    x = (346 - 1) - ((all_addr & 4190208) >> 12)
-    y = (260 - 1) - ((all_addr & 2143289344) >> 22)
-    p = ((all_addr & 2048) >> 11)
-
-    xytp = make_structured_array(x, y, t, p)
+    reader = AEDATReader(filename)
+    xytp = decode_aer_events(reader.events, "davis_346")
     shape = (346, 260)
-    return shape, start_timestamp, xytp
+    return shape, reader.start_timestamp, xytp
 
 
 def read_dvs_346mini(filename):
@@ -179,56 +211,66 @@ def read_dvs_346mini(filename):
     Returns:
         shape (tuple):
             (height, width) of the sensor array
-        xytp: numpy structure of xytp
+        xytp: numpy structured array of events
     """
-    data_version, data_start = read_aedat_header_from_file(filename)
-    all_events = get_aer_events_from_file(filename, data_version, data_start)
-    all_addr = all_events["address"]
-    t = all_events["timeStamp"]
-
-    x = (all_addr >> 22) & 0x01FF
-    y = (all_addr >> 12) & 0x03FF
-    p = (all_addr >> 11) & 0x1
-
-    xytp = make_structured_array(x, y, t, p)
+    xytp = decode_aer_events(AEDATReader(filename).events, "dvs_346mini")
     shape = (132, 104)
     return shape, xytp
 
 
 def read_mnist_file(
-    bin_file: Union[str, BinaryIO], dtype: np.dtype, is_stream: bool = False
+    bin_file: Union[str, BinaryIO],
+    dtype: np.dtype,
+    is_stream: bool = False,
+    out_file: Optional[str] = None,
 ):
     """Reads the events contained in N-MNIST/N-CALTECH101 datasets.
 
     Code adapted from https://github.com/gorchard/event-Python/blob/master/eventvision.py
+
+    Parameters:
+        bin_file: path to the binary file, or a file object if is_stream is True.
+        dtype: structured dtype of the returned events.
+        is_stream: whether bin_file is a file object rather than a path.
+        out_file: optional path of a .npy file that the events are decoded into. The events are
+                  then returned as a memory-mapped array backed by that file.
+
+    Returns:
+        structured numpy array of events.
     """
     if is_stream:
-        raw_data = np.frombuffer(bin_file.read(), dtype=np.uint8).astype(np.uint32)
+        raw_data = np.frombuffer(bin_file.read(), dtype=np.uint8)
     else:
-        with open(bin_file, "rb") as fp:
-            raw_data = np.fromfile(fp, dtype=np.uint8).astype(np.uint32)
-
-    all_y = raw_data[1::5]
-    all_x = raw_data[0::5]
-    all_p = (raw_data[2::5] & 128) >> 7  # bit 7
-    all_ts = ((raw_data[2::5] & 127) << 16) | (raw_data[3::5] << 8) | (raw_data[4::5])
-
-    # Process time stamp overflow events
-    time_increment = 2**13
-    overflow_indices = np.where(all_y == 240)[0]
-    for overflow_index in overflow_indices:
-        all_ts[overflow_index:] += time_increment
-
-    # Everything else is a proper td spike
-    td_indices = np.where(all_y != 240)[0]
-
-    xytp = make_structured_array(
-        all_x[td_indices],
-        all_y[td_indices],
-        all_ts[td_indices],
-        all_p[td_indices],
-        dtype=dtype,
-    )
+        raw_data = np.fromfile(bin_file, dtype=np.uint8)
+
+    # every event is 5 bytes: x, y, polarity and 23 bit timestamp in big-endian order
+    raw_data = raw_data[: len(raw_data) // 5 * 5].reshape(-1, 5)
+    all_ts = (raw_data[:, 2] & 127).astype(np.int64) << 16
+    all_ts += raw_data[:, 3].astype(np.int64) << 8
+    all_ts += raw_data[:, 4]
+
+    # Process time stamp overflow events, which advance the time of all following events
+    is_overflow = raw_data[:, 1] == 240
+    if is_overflow.any():
+        time_increment = 2**13
+        all_ts += np.cumsum(is_overflow, dtype=np.int64) * time_increment
+
+        # Everything else is a proper td spike
+        td_indices = np.flatnonzero(~is_overflow)
+        raw_data = raw_data.view(np.dtype((np.void, 5)))[td_indices]
+        raw_data = raw_data.view(np.uint8).reshape(-1, 5)
+        all_ts = all_ts[td_indices]
+
+    if out_file is None:
+        xytp = np.empty(len(raw_data), dtype=dtype)
+    else:
+        xytp = np.lib.format.open_memmap(
+            out_file, mode="w+", dtype=dtype, shape=(len(raw_data),)
+        )
+    xytp["x"] = raw_data[:, 0]
+    xytp["y"] = raw_data[:, 1]
+    xytp["t"] = all_ts
+    xytp["p"] = raw_data[:, 2] >> 7  # bit 7
     return xytp
 
 
@@ -245,25 +287,213 @@ def read_aedat_header_from_file(filename):
     """
     filename = os.path.expanduser(filename)
     assert os.path.isfile(filename), f"The .aedat file '{filename}' does not exist."
-    f = open(filename, "rb")
-    count = 1
-    is_comment = "#" in str(f.read(count))
-
+    data_version = None
     start_timestamp = None
-    while is_comment:
-        # Read the rest of the line
-        head = str(f.readline())
-        if "!AER-DAT" in head:
-            data_version = float(head[head.find("!AER-DAT") + 8 : -5])
-        elif "Creation time:" in head:
-            start_timestamp = int(head.split()[4].split("\\")[0])
-        is_comment = "#" in str(f.read(1))
-        count += 1
-    data_start = f.seek(-1, 1)
-    f.close()
+    with open(filename, "rb") as f:
+        # header lines start with '#', the binary data starts at the first line that does not
+        while f.peek(1)[:1] == b"#":
+            head = f.readline().decode("latin-1").rstrip()
+            if "!AER-DAT" in head:
+                data_version = float(head[head.find("!AER-DAT") + 8 :])
+            elif "Creation time:" in head:
+                start_timestamp = int(head.split()[-1])
+        data_start = f.tell()
     return data_version, data_start, start_timestamp
 
 
+aedat_event_dtypes = {
+    2: np.dtype([("address", ">u4"), ("timeStamp", ">u4")]),
+    3: np.dtype([("address", "<u4"), ("timeStamp", "<u4")]),
+}
+
+aedat_index_dtype = np.dtype(
+    [
+        ("offset", np.int64),
+        ("n_events", np.int64),
+        ("time_offset", np.int64),
+        ("t_start", np.int64),
+        ("t_stop", np.int64),
+    ]
+)
+
+
+def _index_aedat2_events(buffer, data_start, chunk_size=2**16):
+    """AEDAT 2 files hold a single contiguous stream of events, which is indexed in chunks of
+    chunk_size events so that time-range reads only need to look at two chunks."""
+    n_events = (len(buffer) - data_start) // 8
+    index = np.zeros((n_events + chunk_size - 1) // chunk_size, dtype=aedat_index_dtype)
+    if len(index) == 0:
+        return index
+    timestamps = buffer[data_start : data_start + 8 * n_events].view(
+        aedat_event_dtypes[2]
+    )["timeStamp"]
+    index["offset"] = data_start + 8 * np.arange(0, n_events, chunk_size)
+    index["n_events"] = chunk_size
+    index["n_events"][-1] = n_events - chunk_size * (len(index) - 1)
+    index["t_start"] = timestamps[::chunk_size]
+    index["t_stop"] = timestamps[index["n_events"].cumsum() - 1]
+    return index
+
+
+def _index_aedat3_packets(buffer, data_start):
+    """Scans the 28 byte headers of AEDAT 3 packets without touching the events in between.
+    Packets are assumed to hold 8 byte polarity events, empty packets are not indexed.
+    """
+    buffer = memoryview(buffer)
+    rows = []
+    position = data_start
+    while position + 28 <= len(buffer):
+        ts_overflow, capacity = struct.unpack_from("<iI", buffer, position + 12)
+        offset = position + 28
+        n_events = min(capacity, (len(buffer) - offset) // 8)
+        if n_events > 0:
+            time_offset = ts_overflow << 31
+            first = struct.unpack_from("<I", buffer, offset + 4)[0]
+            last = struct.unpack_from("<I", buffer, offset + 8 * n_events - 4)[0]
+            rows.append(
+                (offset, n_events, time_offset, first + time_offset, last + time_offset)
+            )
+        position = offset + 8 * capacity
+    return np.array(rows, dtype=aedat_index_dtype)
+
+
+class AEDATReader:
+    """Memory-mapped reader for AEDAT 2 and 3 files as written by jAER. The file is mapped rather
+    than read, its packet headers are scanned once to build an index of packet offsets and times,
+    and events are only copied when they are requested.
+
+    Parameters:
+        filename (str): The name of the .aedat file
+        index_file (str): optional path of a .npz file for the packet index, for example next to
+                          the recording. The index is stored together with the size and
+                          modification time of the recording, and loaded from it for as long as
+                          these match. Otherwise the file is scanned and the index saved to it.
+
+    Example:
+        >>> reader = AEDATReader("recording.aedat", index_file="recording.aedat.index.npz")
+        >>> events = reader.read(start_time=1_000_000, end_time=2_000_000)
+
+    Timestamps are assumed to increase within the file. Event times of AEDAT 3 files include the
+    timestamp overflow of their packet, the returned timeStamp fields hold the raw 32 bit values.
+    """
+
+    def __init__(self, filename, index_file: Optional[str] = None):
+        self.filename = os.path.expanduser(filename)
+        (
+            self.data_version,
+            self.data_start,
+            self.start_timestamp,
+        ) = read_aedat_header_from_file(self.filename)
+        if 2 <= self.data_version < 3:
+            self.event_dtype = aedat_event_dtypes[2]
+        elif self.data_version >= 3:
+            self.event_dtype = aedat_event_dtypes[3]
+        else:
+            raise NotImplementedError()
+        self._buffer = np.asarray(np.memmap(self.filename, dtype=np.uint8, mode="r"))
+        self._events = None
+
+        stat = os.stat(self.filename)
+        self.index = None
+        if index_file is not None and os.path.isfile(index_file):
+            self.index = self._load_index(index_file, stat)
+        if self.index is None:
+            self.index = self._scan()
+            if index_file is not None:
+                with open(index_file, "wb") as file:
+                    np.savez(
+                        file,
+                        index=self.index,
+                        size=stat.st_size,
+                        mtime=stat.st_mtime_ns,
+                    )
+
+    @staticmethod
+    def _load_index(index_file, stat):
+        """Returns the stored index if it was built for the current version of the recording."""
+        stored = np.load(index_file)
+        if not isinstance(stored, np.lib.npyio.NpzFile):
+            return None
+        with stored:
+            if (
+                set(stored.files) != {"index", "size", "mtime"}
+                or stored["size"] != stat.st_size
+                or stored["mtime"] != stat.st_mtime_ns
+                or stored["index"].dtype != aedat_index_dtype
+            ):
+                return None
+            return stored["index"]
+
+    def _scan(self):
+        if self.data_version < 3:
+            return _index_aedat2_events(self._buffer, self.data_start)
+        return _index_aedat3_packets(self._buffer, self.data_start)
+
+    def __len__(self):
+        return int(self.index["n_events"].sum())
+
+    def packet(self, i: int) -> np.ndarray:
+        """Returns a read-only view on the events of the i-th indexed packet."""
+        offset, n_events = self.index["offset"][i], self.index["n_events"][i]
+        return self._buffer[offset : offset + 8 * n_events].view(self.event_dtype)
+
+    @property
+    def events(self) -> np.ndarray:
+        """All events of the file. AEDAT 2 events are contiguous and returned as a read-only view
+        on the file, AEDAT 3 events are interleaved with packet headers and copied on first
+        access. Use packet() or read() to access parts of large AEDAT 3 files without a copy of
+        the whole recording.
+        """
+        if self.data_version < 3:
+            return self._buffer[self.data_start : self.data_start + 8 * len(self)].view(
+                self.event_dtype
+            )
+        if self._events is None:
+            self._events = self.read()
+            self._events.flags.writeable = False
+        return self._events
+
+    @property
+    def address(self) -> np.ndarray:
+        return self.events["address"]
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self.events["timeStamp"]
+
+    def read(self, start_time=None, end_time=None) -> np.ndarray:
+        """Copies the events with start_time <= time < end_time out of the file, only touching the
+        packets that overlap with that range.
+
+        Parameters:
+            start_time: inclusive lower bound of the event times, defaults to the first event.
+            end_time: exclusive upper bound of the event times, defaults to after the last event.
+
+        Returns:
+            Numpy structured array with 'address' and 'timeStamp' fields.
+        """
+        selected = np.ones(len(self.index), dtype=bool)
+        if start_time is not None:
+            selected &= self.index["t_stop"] >= start_time
+        if end_time is not None:
+            selected &= self.index["t_start"] < end_time
+        selected = np.flatnonzero(selected)
+        if len(selected) == 0:
+            return np.empty(0, dtype=self.event_dtype)
+
+        packets = [self.packet(i) for i in selected]
+        if start_time is not None:
+            times = self._times(packets[0], selected[0])
+            packets[0] = packets[0][np.searchsorted(times, start_time) :]
+        if end_time is not None:
+            times = self._times(packets[-1], selected[-1])
+            packets[-1] = packets[-1][: np.searchsorted(times, end_time)]
+        return np.concatenate(packets)
+
+    def _times(self, packet, i):
+        return packet["timeStamp"].astype(np.int64) + self.index["time_offset"][i]
+
+
 def get_aer_events_from_file(filename, data_version, data_start):
     """Get aer events from an aer file.
 
@@ -279,25 +509,170 @@ def get_aer_events_from_file(filename, data_version, data_start):
     """
     filename = os.path.expanduser(filename)
     assert os.path.isfile(filename), "The .aedat file does not exist."
-    f = open(filename, "rb")
-    f.seek(data_start)
 
     if 2 <= data_version < 3:
-        event_dtype = np.dtype([("address", ">u4"), ("timeStamp", ">u4")])
-        all_events = np.fromfile(f, event_dtype)
-    elif data_version > 3:
-        event_dtype = np.dtype([("address", "<u4"), ("timeStamp", "<u4")])
-        event_list = []
-        while True:
-            header = f.read(28)
-            if not header or len(header) == 0:
-                break
-
-            # read header
-            capacity = struct.unpack("I", header[16:20])[0]
-            event_list.append(np.fromfile(f, event_dtype, capacity))
-        all_events = np.concatenate(event_list)
+        with open(filename, "rb") as f:
+            f.seek(data_start)
+            all_events = np.fromfile(f, aedat_event_dtypes[2])
+    elif data_version >= 3:
+        # copy the events of all packets straight out of the mapped file
+        buffer = np.asarray(np.memmap(filename, dtype=np.uint8, mode="r"))
+        index = _index_aedat3_packets(buffer, data_start)
+        all_events = np.empty(index["n_events"].sum(), dtype=aedat_event_dtypes[3])
+        stops = index["n_events"].cumsum()
+        for offset, start, stop in zip(
+            index["offset"], stops - index["n_events"], stops
+        ):
+            all_events[start:stop] = buffer[offset : offset + 8 * (stop - start)].view(
+                all_events.dtype
+            )
     else:
         raise NotImplementedError()
-    f.close()
     return all_events
+
+
+def write_packed_samples(
+    folder: str,
+    samples: Iterable[Dict[str, np.ndarray]],
+    dtypes: Dict[str, np.dtype],
+    metadata: Optional[Dict[str, Sequence]] = None,
+    overwrite: bool = False,
+):
+    """Writes samples of variable length into one flat .npy file per field plus an offsets.npy
+    file that holds where every sample starts and stops. The files are streamed to disk one sample
+    at a time and can be memory-mapped with PackedSamples. The folder only appears once all
+    samples are written. Several processes can pack the same samples at once, each one writes to
+    its own temporary folder and the first one to finish moves it into place.
+
+    Parameters:
+        folder: path of the folder that the files are written to.
+        samples: iterable of dictionaries that map field names to 1D arrays. All fields of a
+                 sample have to be of the same length.
+        dtypes: data type of every field, in the order the fields are written.
+        metadata: optional values with one entry per sample, such as targets, that are stored in
+                  metadata.npz once all samples are written.
+        overwrite: whether an existing folder is replaced, for example because it is outdated.
+                   Otherwise an existing folder is kept and the newly written files are discarded.
+    """
+    partial_folder = f"{folder}.{os.getpid()}.{uuid.uuid4().hex}.partial"
+    os.makedirs(partial_folder)
+    try:
+        _write_packed_files(partial_folder, samples, dtypes, metadata)
+    except BaseException:
+        shutil.rmtree(partial_folder, ignore_errors=True)
+        raise
+
+    if overwrite and os.path.isdir(folder):
+        # move the old folder out of the way in one step, so that no half-deleted folder is seen
+        outdated_folder = partial_folder[: -len(".partial")] + ".outdated"
+        try:
+            os.rename(folder, outdated_folder)
+        except FileNotFoundError:
+            pass  # another process has already replaced it
+        else:
+            shutil.rmtree(outdated_folder, ignore_errors=True)
+    try:
+        os.rename(partial_folder, folder)
+    except OSError:
+        if not os.path.isdir(folder):
+            raise
+        # another process has packed the same samples in the meantime, whose files are kept
+        shutil.rmtree(partial_folder, ignore_errors=True)
+
+
+def _write_packed_files(folder, samples, dtypes, metadata):
+    def header(name, length):
+        return {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(dtypes[name])),
+            "fortran_order": False,
+            "shape": (length,),
+        }
+
+    offsets = [0]
+    files = {name: open(os.path.join(folder, f"{name}.npy"), "wb") for name in dtypes}
+    try:
+        for name, file in files.items():
+            np.lib.format.write_array_header_1_0(file, header(name, 0))
+        data_start = {name: file.tell() for name, file in files.items()}
+        for sample in samples:
+            length = len(sample[next(iter(dtypes))])
+            for name, file in files.items():
+                values = np.ascontiguousarray(sample[name], dtype=dtypes[name])
+                if len(values) != length:
+                    raise ValueError(
+                        f"Field '{name}' has {len(values)} values, but the sample has {length}."
+                    )
+                file.write(values)
+            offsets.append(offsets[-1] + length)
+        # the header reserves space for the length, so it can be rewritten in place
+        for name, file in files.items():
+            file.seek(0)
+            np.lib.format.write_array_header_1_0(file, header(name, offsets[-1]))
+            assert file.tell() == data_start[name]
+    finally:
+        for file in files.values():
+            file.close()
+    np.save(os.path.join(folder, "offsets.npy"), np.array(offsets, dtype=np.int64))
+    if metadata is not None:
+        np.savez(
+            os.path.join(folder, "metadata.npz"),
+            **{name: np.asarray(values) for name, values in metadata.items()},
+        )
+
+
+def packed_outdated(folder: str, source_file: str) -> bool:
+    """Whether folder does not hold packed samples yet or is older than the file they came from.
+    Packed samples stay valid when the source file has been removed.
+
+    Parameters:
+        folder: path of a folder written by write_packed_samples.
+        source_file: path of the file that the samples were read from.
+    """
+    if not os.path.isdir(folder):
+        return True
+    return os.path.exists(source_file) and os.path.getmtime(folder) < os.path.getmtime(
+        source_file
+    )
+
+
+class PackedSamples:
+    """Reads samples written by write_packed_samples. The fields are memory-mapped, so that
+    samples are served as zero-copy slices and processes that read the same files share the page
+    cache.
+
+    Parameters:
+        folder: path of the folder written by write_packed_samples.
+
+    Example:
+        >>> samples = PackedSamples("shd_train_packed")
+        >>> samples[0]["times"], samples[0]["units"]
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.offsets = np.load(os.path.join(folder, "offsets.npy"))
+        self.fields = {
+            name[: -len(".npy")]: np.load(os.path.join(folder, name), mmap_mode="r")
+            for name in sorted(os.listdir(folder))
+            if name.endswith(".npy") and name != "offsets.npy"
+        }
+        self.metadata = {}
+        if os.path.isfile(os.path.join(folder, "metadata.npz")):
+            with np.load(os.path.join(folder, "metadata.npz")) as metadata:
+                self.metadata = dict(metadata)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index) -> Dict[str, np.ndarray]:
+        if index < 0:
+            index += len(self)
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return {name: values[start:stop] for name, values in self.fields.items()}
+
+    def __getstate__(self):
+        # memory maps would be pickled as copies of the whole file
+        return {"folder": self.folder}
+
+    def __setstate__(self, state):
+        self.__init__(state["folder"])
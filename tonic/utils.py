@@ -1,8 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 
 import numpy as np
 
 import tonic.transforms as transforms
+from tonic.functional.drop_pixel import count_pixel_events
 
 
 def plot_event_grid(
@@ -125,3 +127,60 @@ def plot_animation(frames: np.ndarray, figsize: Tuple[int, int] = (5, 5)):
     anim = animation.FuncAnimation(fig, animate, frames=frames, interval=100)
     plt.show()
     return anim
+
+
+def hot_pixel_mask(
+    dataset,
+    sensor_size: Tuple[int, int, int],
+    hot_pixel_frequency: float,
+    num_workers: int = 0,
+):
+    """Identifies pixels that fire above a certain frequency, averaged across all recordings of a
+    dataset. For fixed cameras, hot pixels do not change between samples, so the mask can be
+    computed once, saved and passed to DropPixel instead of detecting hot pixels per sample.
+
+    Parameters:
+        dataset: indexable dataset that returns (events, target) tuples.
+        sensor_size: a 3-tuple of x,y,p for sensor_size.
+        hot_pixel_frequency: number of spikes per second allowed for each pixel, any pixel firing
+                             above that frequency will be marked.
+        num_workers: number of threads that load and count samples in parallel. Zero means
+                     samples are processed sequentially.
+
+    Example:
+        >>> import numpy as np
+        >>> import tonic
+        >>> dataset = tonic.datasets.DVSGesture(save_to='./data', train=True)
+        >>> mask = tonic.utils.hot_pixel_mask(dataset, dataset.sensor_size, hot_pixel_frequency=60)
+        >>> np.save("hot_pixels.npy", mask)
+        >>>
+        >>> transform = tonic.transforms.DropPixel(coordinates=np.load("hot_pixels.npy"))
+
+    Returns:
+        boolean ndarray of shape [height, width] that is True for excessively firing pixels.
+    """
+
+    def count(index):
+        events = dataset[index][0]
+        if len(events) == 0:
+            return 0, 0
+        return (
+            count_pixel_events(events, sensor_size),
+            events["t"][-1] - events["t"][0],
+        )
+
+    counts = np.zeros(sensor_size[1::-1], dtype=np.int64)
+    total_time = 0
+    if num_workers > 0:
+        with ThreadPoolExecutor(num_workers) as executor:
+            results = executor.map(count, range(len(dataset)))
+            for sample_counts, sample_time in results:
+                counts += sample_counts
+                total_time += sample_time
+    else:
+        for index in range(len(dataset)):
+            sample_counts, sample_time = count(index)
+            counts += sample_counts
+            total_time += sample_time
+
+    return counts > hot_pixel_frequency * total_time * 1e-6